@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from app.services.openrouter_service import OpenRouterService
+from app.services.chat_context_service import ChatContextService
+from app.services.openrouter_service import OpenRouterService, stream_stats
 from app.services.resume_service import ResumeService
 from app.core.prompts import ResumeAssistantPrompts
 from app.core.database import get_db
@@ -66,10 +67,17 @@ async def chat_with_resume(
         
         # 使用新的提示词管理系统，包含聊天历史
         openrouter_service = OpenRouterService()
+        # 只发送与当前问题相关的简历模块
+        resume_context = ChatContextService(db).build_context(
+            resume,
+            chat_request.message,
+            chat_request.chat_history
+        )
         messages = ResumeAssistantPrompts.build_chat_messages(
             chat_request.message,
             resume_content,
-            chat_request.chat_history
+            chat_request.chat_history,
+            resume_context
         )
         
         # 调用AI服务
@@ -97,6 +105,7 @@ async def chat_with_resume(
 @router.post("/chat/stream")
 async def chat_with_resume_stream(
     chat_request: ChatRequest,
+    request: Request,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -156,20 +165,35 @@ async def chat_with_resume_stream(
             else:
                 # 普通模式：使用简历优化师提示词
                 print("Debug - 使用简历优化师提示词")
+                resume_context = ChatContextService(db).build_context(
+                    resume,
+                    chat_request.message,
+                    chat_request.chat_history
+                )
                 messages = ResumeAssistantPrompts.build_chat_messages(
                     chat_request.message,
                     resume_content,
-                    chat_request.chat_history
+                    chat_request.chat_history,
+                    resume_context
                 )
             
             # 流式响应
-            async for content_chunk in openrouter_service.chat_completion_stream(messages):
-                # 以Server-Sent Events格式发送
-                data = {
-                    "content": content_chunk,
-                    "done": False
-                }
-                yield f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+            upstream = openrouter_service.chat_completion_stream(messages)
+            try:
+                async for content_chunk in upstream:
+                    # 客户端已断开（如关闭页面）时立即终止上游生成，避免继续消耗token
+                    if await request.is_disconnected():
+                        print(f"客户端已断开，取消简历 {chat_request.resume_id} 的流式生成")
+                        return
+                    
+                    # 以Server-Sent Events格式发送
+                    data = {
+                        "content": content_chunk,
+                        "done": False
+                    }
+                    yield f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+            finally:
+                await upstream.aclose()
             
             # 发送结束标记
             end_data = {"content": "", "done": True}
@@ -204,7 +228,8 @@ async def get_ai_status():
             return {
                 "service": "openrouter",
                 "status": "connected",
-                "is_configured": True
+                "is_configured": True,
+                "stream_stats": stream_stats.snapshot()
             }
         else:
             return {
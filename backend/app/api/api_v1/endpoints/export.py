@@ -1,11 +1,19 @@
 import os
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+from datetime import timezone
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Iterator, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.database import get_db
+from app.models.resume import Resume
 from app.services.export_service import ExportService
+from app.services.render_pool import render_pool, RenderQueueFullError, RenderTimeoutError
 from app.services.resume_service import ResumeService
-from app.schemas.export import ExportRequest, ExportResponse
+from app.services.html_template_service import html_template_registry
+from app.services.bulk_export_service import bulk_export_service
+from app.schemas.export import ExportRequest, ExportResponse, ExportPreviewRequest, BulkExportRequest
 from app.api.deps import get_current_user
 
 router = APIRouter()
@@ -35,21 +43,24 @@ async def export_resume(
             detail="Not enough permissions"
         )
     
+    if export_request.format not in ("pdf", "docx", "html"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported export format"
+        )
+    
     try:
         export_service = ExportService()
         
-        # 根据格式导出
-        if export_request.format == "pdf":
-            filepath = export_service.export_to_pdf(resume.content, export_request.template)
-        elif export_request.format == "docx":
-            filepath = export_service.export_to_docx(resume.content, export_request.template)
-        elif export_request.format == "html":
-            filepath = export_service.export_to_html(resume.content, export_request.template)
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Unsupported export format"
-            )
+        if export_request.inline:
+            return await _inline_export_response(export_service, resume.content, export_request)
+        
+        # 提交到渲染进程池，避免同步渲染阻塞事件循环
+        filepath = await render_pool.render(
+            resume.content,
+            export_request.format,
+            export_request.template
+        )
         
         # 获取文件URL
         download_url = export_service.get_file_url(filepath)
@@ -61,37 +72,299 @@ async def export_resume(
             format=export_request.format
         )
         
+    except RenderQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+    except RenderTimeoutError as e:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to export resume: {str(e)}"
         )
 
+@router.post("/export/bulk")
+async def bulk_export_resumes(
+    bulk_request: BulkExportRequest,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """批量导出多份简历为一个ZIP，边渲染边输出"""
+    
+    # 去重并保持请求顺序
+    resume_ids = list(dict.fromkeys(bulk_request.resume_ids))
+    formats = list(dict.fromkeys(bulk_request.formats))
+    
+    if not resume_ids or not formats:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="resume_ids and formats must not be empty"
+        )
+    
+    if len(resume_ids) > settings.EXPORT_BULK_MAX_RESUMES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.EXPORT_BULK_MAX_RESUMES} resumes can be exported at once"
+        )
+    
+    if any(export_format not in ExportService.MEDIA_TYPES for export_format in formats):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported export format"
+        )
+    
+    # 验证简历权限（一次查询），并在开始输出前读出内容，流式输出期间不再访问数据库
+    rows = db.query(Resume.id, Resume.title, Resume.content, Resume.owner_id).filter(
+        Resume.id.in_(resume_ids)
+    ).all()
+    resumes_by_id = {row.id: row for row in rows}
+    
+    if len(resumes_by_id) != len(resume_ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    if any(row.owner_id != current_user["id"] for row in rows):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    resumes = [
+        {"id": row.id, "title": row.title, "content": row.content}
+        for row in (resumes_by_id[resume_id] for resume_id in resume_ids)
+    ]
+    
+    return StreamingResponse(
+        bulk_export_service.stream_zip(resumes, formats, bulk_request.template),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="resumes.zip"'}
+    )
+
+@router.post("/{resume_id}/export/preview")
+async def preview_resume_html(
+    resume_id: int,
+    preview_request: ExportPreviewRequest,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """使用预编译模板流式渲染HTML预览，开销足够小，可在编辑时实时调用"""
+    
+    # 验证简历权限
+    resume_service = ResumeService(db)
+    resume = resume_service.get_by_id(resume_id)
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    if resume.owner_id != current_user["id"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    resume_content = preview_request.content if preview_request.content is not None else resume.content
+    
+    return StreamingResponse(
+        html_template_registry.stream(resume_content, preview_request.template),
+        media_type="text/html; charset=utf-8"
+    )
+
+async def _inline_export_response(export_service: ExportService, resume_content: dict, export_request: ExportRequest) -> Response:
+    """在同一响应中返回导出文件内容，省去下载请求"""
+    media_type = export_service.MEDIA_TYPES[export_request.format]
+    cached_path = export_service.get_cached_path(resume_content, export_request.format, export_request.template)
+    filename = os.path.basename(cached_path)
+    
+    # 已有相同内容的导出文件时直接返回该文件
+    if os.path.exists(cached_path):
+        export_service.mark_used(cached_path)
+        return FileResponse(path=cached_path, media_type=media_type, filename=filename)
+    
+    # 在内存中渲染，不写入导出目录
+    content = await render_pool.render_bytes(
+        resume_content,
+        export_request.format,
+        export_request.template
+    )
+    
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+# 内容地址文件对应的简历渲染结果不变，可长期缓存（重新渲染后字节可能不同，ETag按字节计算）；
+# 其他文件每次需向服务端验证
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def _etag_matches(header_value: str, etag: str, strong: bool = False) -> bool:
+    """判断 If-None-Match / If-Range 中是否包含当前ETag
+    
+    If-None-Match 使用弱比较；If-Range 使用强比较（strong=True），弱ETag不匹配
+    """
+    if header_value.strip() == "*":
+        return not strong
+    candidates = [value.strip() for value in header_value.split(",")]
+    if strong:
+        return etag in candidates
+    return etag in [value[2:] if value.startswith("W/") else value for value in candidates]
+
+
+def _parse_http_date(header_value: str) -> Optional[float]:
+    """解析HTTP日期为时间戳，无法解析时返回None"""
+    try:
+        value = parsedate_to_datetime(header_value)
+    except (TypeError, ValueError):
+        return None
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _not_modified_since(header_value: str, mtime: float) -> bool:
+    """If-Modified-Since 时间不早于文件修改时间时返回 True（HTTP日期精度为秒）"""
+    since = _parse_http_date(header_value)
+    return since is not None and int(mtime) <= since
+
+
+def _last_modified_matches(header_value: str, mtime: float) -> bool:
+    """If-Range 中的日期与 Last-Modified 完全一致时返回 True（If-Range 要求强验证，不能用早于/晚于判断）"""
+    since = _parse_http_date(header_value)
+    return since is not None and int(mtime) == since
+
+
+def _parse_range(header_value: str, file_size: int) -> Optional[Tuple[int, int]]:
+    """解析单个 bytes 区间，返回 (start, end)
+
+    不支持的单位、多区间或格式错误时返回 None（按普通请求返回完整文件）；
+    区间无法满足时抛出 ValueError。
+    """
+    unit, _, ranges = header_value.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+
+    start_str, _, end_str = ranges.strip().partition("-")
+    if not (start_str.isdigit() or start_str == "") or not (end_str.isdigit() or end_str == ""):
+        return None
+
+    if start_str == "":
+        # 后缀区间：最后N个字节
+        if end_str == "":
+            return None
+        length = int(end_str)
+        start, end = max(file_size - length, 0), file_size - 1
+        if length == 0:
+            raise ValueError("empty suffix range")
+    else:
+        start = int(start_str)
+        end = min(int(end_str), file_size - 1) if end_str else file_size - 1
+
+    if start > end or start >= file_size:
+        raise ValueError("unsatisfiable range")
+    return start, end
+
+
+def _iter_file_range(filepath: str, start: int, end: int) -> Iterator[bytes]:
+    """按块读取文件的指定区间"""
+    with open(filepath, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
 @router.get("/download/{filename}")
-async def download_file(filename: str):
-    """下载导出的文件"""
+async def download_file(filename: str, request: Request):
+    """下载导出的文件，支持 ETag / Last-Modified 条件请求和断点续传（Range）"""
     
     export_service = ExportService()
+    
+    # 只允许访问导出目录下的文件
+    if os.path.basename(filename) != filename or filename.startswith("."):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found"
+        )
+    
     filepath = os.path.join(export_service.export_dir, filename)
     
-    if not os.path.exists(filepath):
+    if not os.path.isfile(filepath):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found"
         )
     
     # 获取文件扩展名来设置media_type
-    file_extension = os.path.splitext(filename)[1].lower()
-    media_type_map = {
-        '.pdf': 'application/pdf',
-        '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        '.html': 'text/html'
+    file_extension = os.path.splitext(filename)[1].lower().lstrip('.')
+    media_type = export_service.MEDIA_TYPES.get(file_extension, 'application/octet-stream')
+    
+    stat = os.stat(filepath)
+    etag = export_service.get_file_etag(filepath)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if export_service.is_content_addressed(filename) else REVALIDATE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes"
     }
     
-    media_type = media_type_map.get(file_extension, 'application/octet-stream')
+    # 记录最近下载时间
+    export_service.mark_used(filepath)
+    
+    # 条件请求：有 If-None-Match 时忽略 If-Modified-Since
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if (if_none_match and _etag_matches(if_none_match, etag)) or \
+            (not if_none_match and if_modified_since and _not_modified_since(if_modified_since, stat.st_mtime)):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or _etag_matches(if_range, etag, strong=True) or _last_modified_matches(if_range, stat.st_mtime)):
+        try:
+            byte_range = _parse_range(range_header, stat.st_size)
+        except ValueError:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**headers, "Content-Range": f"bytes */{stat.st_size}"}
+            )
+        
+        if byte_range is not None:
+            start, end = byte_range
+            return StreamingResponse(
+                _iter_file_range(filepath, start, end),
+                status_code=status.HTTP_206_PARTIAL_CONTENT,
+                media_type=media_type,
+                headers={
+                    **headers,
+                    "Content-Range": f"bytes {start}-{end}/{stat.st_size}",
+                    "Content-Length": str(end - start + 1),
+                    "Content-Disposition": f'attachment; filename="{filename}"'
+                }
+            )
     
     return FileResponse(
         path=filepath,
         media_type=media_type,
-        filename=filename
-    )
\ No newline at end of file
+        filename=filename,
+        headers=headers,
+        stat_result=stat
+    )
@@ -1,14 +1,22 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
 from app.core.database import get_db
+from app.core.pagination import MAX_PAGE_SIZE, keyset_page, set_next_cursor
 from app.services.openrouter_service import OpenRouterService
 from app.services.interview_report_service import InterviewReportService
 from app.services.resume_service import ResumeService
+from app.services.interview_prefetch_service import interview_prefetch_service, build_conversation_history
+from app.services.interview_turn_service import InterviewTurnService
+from app.services.interview_scoring_service import InterviewScoringService
+from app.services.score_backfill_service import score_backfill_service
+from app.services.interview_stats_service import InterviewStatsService
 from app.models.resume import InterviewSession
 from app.schemas.interview import (
     InterviewSessionCreate, 
     InterviewSessionResponse, 
+    InterviewSessionSummary,
     InterviewQuestionResponse,
     InterviewAnswerRequest,
     InterviewEvaluationResponse
@@ -67,12 +75,13 @@ async def start_interview(
             job_position=session_create.job_position,
             interview_mode=session_create.interview_mode,
             jd_content=session_create.jd_content,
-            questions=questions,
-            answers=[],
             feedback={},
             status="active"
         )
+        for question_index, question in enumerate(questions):
+            interview_session.add_turn(question, question_index)
         db.add(interview_session)
+        InterviewStatsService(db).apply_session_change(current_user["id"], None, ("active", None))
         db.commit()
         db.refresh(interview_session)
         
@@ -127,27 +136,20 @@ async def get_next_question(
             question_index=current_question_index
         )
     
-    # 如果已经回答完所有预设问题，根据对话历史生成新问题
+    # 如果已经回答完所有预设问题，优先使用后台预生成的问题，否则根据对话历史即时生成
     try:
-        openrouter_service = OpenRouterService()
-        
-        # 构建对话历史
-        conversation_history = []
-        for i, answer in enumerate(interview_session.answers):
-            if i < len(interview_session.questions):
-                conversation_history.append({
-                    "question": interview_session.questions[i]["question"],
-                    "answer": answer["answer"]
-                })
+        new_question = await interview_prefetch_service.take(db, interview_session, current_question_index)
         
-        # 生成新问题
-        new_question = await openrouter_service.generate_next_interview_question(
-            conversation_history, 
-            resume.content
-        )
+        if new_question is None:
+            openrouter_service = OpenRouterService()
+            new_question = await openrouter_service.generate_next_interview_question(
+                build_conversation_history(interview_session),
+                resume.content
+            )
         
-        # 更新会话问题列表
-        interview_session.questions.append(new_question)
+        # 追加新问题（插入一个轮次）
+        interview_session.add_turn(new_question, current_question_index)
+        interview_session.prefetched_question = None
         db.commit()
         
         return InterviewQuestionResponse(
@@ -197,49 +199,79 @@ async def submit_answer(
     try:
         # 获取当前问题
         question_index = answer_request.question_index
+        turn = interview_session.get_turn(question_index)
         
-        if question_index >= len(interview_session.questions):
+        if turn is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid question index"
             )
         
-        current_question = interview_session.questions[question_index]["question"]
+        current_question = turn.question
         
-        # 使用 OpenRouter 评估答案
-        openrouter_service = OpenRouterService()
-        evaluation = await openrouter_service.evaluate_interview_answer(
-            current_question,
-            answer_request.answer,
-            resume.content
-        )
+        # 预设问题用完后，下一个问题需要由AI生成
+        answered_count = max(len(interview_session.answers), question_index + 1)
+        needs_next_question = answered_count >= len(interview_session.questions)
+        next_question = None
         
-        # 保存答案和评估
-        answer_data = {
-            "answer": answer_request.answer,
-            "evaluation": evaluation,
-            "question_index": question_index
-        }
-        
-        # 更新会话答案 - 复制列表以确保SQLAlchemy检测到变化
-        current_answers = list(interview_session.answers or [])
+        if needs_next_question:
+            # 一次调用同时完成评估和下一个问题生成
+            turn_service = InterviewTurnService()
+            turn_result = await turn_service.process_turn(
+                current_question,
+                answer_request.answer,
+                build_conversation_history(interview_session),
+                resume.content
+            )
+            evaluation = turn_result["evaluation"]
+            next_question = turn_result["next_question"]
+        else:
+            # 使用 OpenRouter 评估答案
+            openrouter_service = OpenRouterService()
+            evaluation = await openrouter_service.evaluate_interview_answer(
+                current_question,
+                answer_request.answer,
+                resume.content
+            )
         
-        # 扩展答案列表到所需长度
-        while len(current_answers) <= question_index:
-            current_answers.append({})
+        # 保存答案和评估（只更新当前轮次）
+        turn.answer = answer_request.answer
+        turn.evaluation = evaluation
+        turn.score = evaluation.get("score")
+        turn.answered_at = func.now()
         
-        # 设置答案数据
-        current_answers[question_index] = answer_data
+        # 逐题累积分数和能力信号，结束面试时只需本地汇总
+        jd_keywords = None
+        if interview_session.jd_content:
+            jd_keywords = InterviewReportService()._extract_jd_keywords(interview_session.jd_content)
+        scoring_service = InterviewScoringService()
+        signals = scoring_service.score_answer_signals(
+            current_question,
+            answer_request.answer,
+            jd_keywords=jd_keywords,
+            llm_score=evaluation.get("score")
+        )
+        interview_session.score_summary = scoring_service.accumulate_answer_signals(
+            interview_session.score_summary, question_index, signals
+        )
         
-        # 重新分配列表以触发SQLAlchemy的变化检测
-        interview_session.answers = current_answers
+        # 合并调用得到的下一个问题直接保存，获取问题时即可立即返回
+        if next_question:
+            interview_session.prefetched_question = {
+                **next_question,
+                "question_index": answered_count
+            }
         db.commit()
         
+        # 合并调用未返回有效问题时，回退为后台预生成
+        if needs_next_question and not next_question:
+            interview_prefetch_service.schedule(interview_session.id)
+        
         return InterviewEvaluationResponse(
             question=current_question,
             answer=answer_request.answer,
             evaluation=evaluation,
-            score=evaluation.get("score", 0),
+            score=evaluation.get("score"),
             feedback=evaluation.get("feedback", ""),
             suggestions=evaluation.get("suggestions", [])
         )
@@ -281,22 +313,19 @@ async def end_interview(
             detail="Not enough permissions"
         )
     
+    stats_service = InterviewStatsService(db)
+    previous_state = (interview_session.status, interview_session.overall_score)
+    
     try:
-        # 计算整体面试分数
-        openrouter_service = OpenRouterService()
-        
-        # 将面试会话转换为字典格式以便传递给分数计算函数
-        session_dict = {
-            "questions": interview_session.questions,
-            "answers": interview_session.answers,
-            "feedback": interview_session.feedback
-        }
-        
-        overall_score = await openrouter_service.calculate_overall_score(session_dict)
+        # 优先由逐题累积的信号本地汇总整体分数
+        overall_score = await InterviewScoringService().calculate_session_overall_score(interview_session)
         
         # 更新会话状态和分数
         interview_session.status = "completed"
         interview_session.overall_score = overall_score
+        stats_service.apply_session_change(
+            current_user["id"], previous_state, (interview_session.status, interview_session.overall_score)
+        )
         db.commit()
         
         return {
@@ -306,7 +335,11 @@ async def end_interview(
         
     except Exception as e:
         # 即使分数计算失败，也要结束面试
+        db.rollback()
         interview_session.status = "completed"
+        stats_service.apply_session_change(
+            current_user["id"], previous_state, (interview_session.status, interview_session.overall_score)
+        )
         db.commit()
         
         return {
@@ -314,13 +347,21 @@ async def end_interview(
             "warning": f"Failed to calculate overall score: {str(e)}"
         }
 
-@router.get("/{resume_id}/interview/sessions", response_model=List[InterviewSessionResponse])
+@router.get("/{resume_id}/interview/sessions", response_model=List[Union[InterviewSessionResponse, InterviewSessionSummary]])
 async def get_interview_sessions(
     resume_id: int,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = Query(None, ge=1),
+    view: str = Query("full", pattern="^(full|summary)$"),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """获取面试会话列表"""
+    """获取面试会话列表
+
+    view=summary 时只返回摘要（不含问题、回答和反馈）；传入 limit 时按游标分页，
+    下一页游标通过 X-Next-Cursor 响应头返回。
+    """
     
     # 验证简历权限
     resume_service = ResumeService(db)
@@ -338,10 +379,23 @@ async def get_interview_sessions(
             detail="Not enough permissions"
         )
     
-    # 获取面试会话
-    sessions = db.query(InterviewSession).filter(
-        InterviewSession.resume_id == resume_id
-    ).order_by(InterviewSession.created_at.desc()).all()
+    if view == "summary":
+        rows, next_cursor = resume_service.get_interview_session_summaries(
+            current_user["id"], resume_id=resume_id, limit=limit, cursor=cursor
+        )
+        set_next_cursor(response, next_cursor)
+        return [InterviewSessionSummary.model_validate(row) for row in rows]
+    
+    # 获取面试会话（轮次一次性批量加载）
+    sessions, next_cursor = keyset_page(
+        db.query(InterviewSession).options(selectinload(InterviewSession.turns)).filter(
+            InterviewSession.resume_id == resume_id
+        ).order_by(InterviewSession.created_at.desc()),
+        InterviewSession.id,
+        limit,
+        cursor
+    )
+    set_next_cursor(response, next_cursor)
     
     return [InterviewSessionResponse.model_validate(session) for session in sessions]
 
@@ -383,6 +437,9 @@ async def delete_interview_session(
         )
     
     # 删除面试会话
+    InterviewStatsService(db).apply_session_change(
+        current_user["id"], (interview_session.status, interview_session.overall_score), None
+    )
     db.delete(interview_session)
     db.commit()
     
@@ -412,46 +469,48 @@ async def calculate_scores_for_completed_interviews(
             detail="Not enough permissions"
         )
     
-    # 查找已完成但没有分数的面试
-    sessions = db.query(InterviewSession).filter(
-        InterviewSession.resume_id == resume_id,
-        InterviewSession.status == "completed",
-        InterviewSession.overall_score.is_(None)
-    ).all()
-    
-    if not sessions:
-        return {"message": "No interviews need score calculation", "updated_count": 0}
-    
-    updated_count = 0
-    openrouter_service = OpenRouterService()
-    
-    for session in sessions:
-        try:
-            # 将面试会话转换为字典格式
-            session_dict = {
-                "questions": session.questions,
-                "answers": session.answers,
-                "feedback": session.feedback
-            }
-            
-            overall_score = await openrouter_service.calculate_overall_score(session_dict)
-            
-            if overall_score > 0:  # 只有成功计算出分数才更新
-                session.overall_score = overall_score
-                updated_count += 1
-                
-        except Exception as e:
-            print(f"Failed to calculate score for session {session.id}: {e}")
-            continue
-    
-    if updated_count > 0:
-        db.commit()
+    # 在后台分批计算分数，每个会话单独提交；同一简历重复调用会返回正在运行的任务。
+    # 刚启动的任务还没有结果，调用方通过 calculate-scores/status 轮询到任务结束
+    job = score_backfill_service.start(resume_id)
     
     return {
-        "message": f"Successfully calculated scores for {updated_count} interviews",
-        "updated_count": updated_count
+        "message": f"Score calculation job {job.status}",
+        "job": job.snapshot()
     }
 
+@router.get("/{resume_id}/interview/calculate-scores/status")
+async def get_score_calculation_status(
+    resume_id: int,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """获取分数计算任务进度"""
+    
+    # 验证简历权限
+    resume_service = ResumeService(db)
+    resume = resume_service.get_by_id(resume_id)
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    if resume.owner_id != current_user["id"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    job = score_backfill_service.get_job(resume_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No score calculation job found"
+        )
+    
+    return job.snapshot()
+
 @router.post("/{resume_id}/interview/cleanup-duplicate")
 async def cleanup_duplicate_sessions(
     resume_id: int,
@@ -491,6 +550,9 @@ async def cleanup_duplicate_sessions(
         for session in sessions_to_delete:
             # 只删除没有答案的空会话
             if not session.answers or len(session.answers) == 0:
+                InterviewStatsService(db).apply_session_change(
+                    current_user["id"], (session.status, session.overall_score), None
+                )
                 db.delete(session)
                 cleaned_count += 1
                 print(f"删除空的重复面试会话: {session.id}")
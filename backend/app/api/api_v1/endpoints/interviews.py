@@ -1,63 +1,104 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session, selectinload
 from app.core.database import get_db
+from app.core.pagination import MAX_PAGE_SIZE, keyset_page, set_next_cursor
 from app.models.resume import InterviewSession, Resume
-from app.schemas.interview import InterviewSessionResponse
+from app.schemas.interview import InterviewSessionResponse, InterviewSessionSummary
+from app.services.resume_service import ResumeService
+from app.services.interview_stats_service import InterviewStatsService
 from app.api.deps import get_current_user
 
 router = APIRouter()
 
-@router.get("/", response_model=List[InterviewSessionResponse])
+@router.get("/", response_model=List[Union[InterviewSessionResponse, InterviewSessionSummary]])
 async def get_all_interview_sessions(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = Query(None, ge=1),
+    view: str = Query("full", pattern="^(full|summary)$"),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """获取当前用户的所有面试会话"""
-    
-    # 获取用户所有简历的面试会话
-    sessions = db.query(InterviewSession).join(Resume).filter(
-        Resume.owner_id == current_user["id"]
-    ).order_by(InterviewSession.created_at.desc()).all()
-    
-    # 为每个会话添加简历标题
-    result = []
-    for session in sessions:
-        session_data = InterviewSessionResponse.model_validate(session)
-        # 添加简历标题到响应中
-        session_dict = session_data.model_dump()
-        session_dict["resume_title"] = session.resume.title
-        result.append(session_dict)
-    
-    return result
+    """获取当前用户的所有面试会话
+
+    view=summary 时只返回摘要（不含问题、回答和反馈）；传入 limit 时按游标分页，
+    下一页游标通过 X-Next-Cursor 响应头返回。完整内容通过 GET /interviews/{session_id} 获取。
+    """
+    
+    if view == "summary":
+        rows, next_cursor = ResumeService(db).get_interview_session_summaries(
+            current_user["id"], limit=limit, cursor=cursor
+        )
+        set_next_cursor(response, next_cursor)
+        return [InterviewSessionSummary.model_validate(row) for row in rows]
+    
+    # 一次联表查询取出会话和简历标题，轮次用一次批量查询加载，避免逐个会话懒加载
+    rows, next_cursor = keyset_page(
+        db.query(InterviewSession, Resume.title).join(
+            Resume, InterviewSession.resume_id == Resume.id
+        ).options(selectinload(InterviewSession.turns)).filter(
+            Resume.owner_id == current_user["id"]
+        ).order_by(InterviewSession.created_at.desc()),
+        InterviewSession.id,
+        limit,
+        cursor,
+        get_id=lambda row: row[0].id
+    )
+    set_next_cursor(response, next_cursor)
+    
+    # 直接构建响应数据，由响应模型统一校验和序列化一次
+    return [
+        {
+            "id": session.id,
+            "resume_id": session.resume_id,
+            "resume_title": resume_title,
+            "job_position": session.job_position,
+            "interview_mode": session.interview_mode,
+            "jd_content": session.jd_content,
+            "questions": session.questions,
+            "answers": session.answers,
+            "feedback": session.feedback,
+            "status": session.status,
+            "created_at": session.created_at,
+            "updated_at": session.updated_at
+        }
+        for session, resume_title in rows
+    ]
 
 @router.get("/stats")
 async def get_interview_stats(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """获取面试统计信息"""
-    
-    # 获取总面试次数
-    total_interviews = db.query(InterviewSession).join(Resume).filter(
-        Resume.owner_id == current_user["id"]
-    ).count()
-    
-    # 获取已完成面试次数
-    completed_interviews = db.query(InterviewSession).join(Resume).filter(
-        Resume.owner_id == current_user["id"],
-        InterviewSession.status == "completed"
-    ).count()
-    
-    # 获取进行中面试次数
-    active_interviews = db.query(InterviewSession).join(Resume).filter(
-        Resume.owner_id == current_user["id"],
-        InterviewSession.status == "active"
-    ).count()
-    
-    return {
-        "total_interviews": total_interviews,
-        "completed_interviews": completed_interviews,
-        "active_interviews": active_interviews,
-        "completion_rate": round(completed_interviews / max(total_interviews, 1) * 100, 1)
-    }
\ No newline at end of file
+    """获取面试统计信息（会话数、完成率、平均分和分数趋势）"""
+    
+    return InterviewStatsService(db).get_stats(current_user["id"])
+
+@router.get("/{session_id}", response_model=InterviewSessionResponse)
+async def get_interview_session(
+    session_id: int,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """获取单个面试会话的完整内容"""
+    
+    interview_session = db.query(InterviewSession).filter(
+        InterviewSession.id == session_id
+    ).first()
+    
+    if not interview_session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Interview session not found"
+        )
+    
+    # 验证简历权限
+    resume = ResumeService(db).get_by_id(interview_session.resume_id)
+    if not resume or resume.owner_id != current_user["id"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    return InterviewSessionResponse.model_validate(interview_session)
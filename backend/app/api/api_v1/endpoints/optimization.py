@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.database import get_db
-from app.services.openrouter_service import OpenRouterService
+from app.services.embedding_service import EmbeddingService
+from app.services.jd_matching_service import BulkJDMatchingService
+from app.services.optimization_service import IncrementalOptimizationService
 from app.services.resume_service import ResumeService
-from app.schemas.resume import OptimizationRequest, OptimizationResponse
+from app.schemas.resume import OptimizationRequest, OptimizationResponse, BulkJDMatchRequest, SimilarJDResponse
 from app.models.resume import OptimizationRecord
 from app.api.deps import get_current_user
 
@@ -35,10 +41,11 @@ async def optimize_resume(
         )
     
     try:
-        # 调用 OpenRouter API 进行分析
-        openrouter_service = OpenRouterService()
-        analysis_result = await openrouter_service.analyze_resume_jd_match(
-            resume.content, 
+        # 按模块增量分析，未变化的模块沿用上一次针对同一JD的结果
+        optimization_service = IncrementalOptimizationService()
+        analysis_result = await optimization_service.optimize(
+            db,
+            resume,
             optimization_request.jd_content
         )
         
@@ -49,6 +56,8 @@ async def optimize_resume(
             suggestions=analysis_result
         )
         db.add(optimization_record)
+        db.flush()
+        EmbeddingService(db).index_jd(optimization_record)
         db.commit()
         db.refresh(optimization_record)
         
@@ -60,6 +69,89 @@ async def optimize_resume(
             detail=f"Failed to optimize resume: {str(e)}"
         )
 
+@router.post("/{resume_id}/match-jds")
+async def match_resume_to_jds(
+    resume_id: int,
+    match_request: BulkJDMatchRequest,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """简历与多个JD批量匹配（SSE流式返回）
+    
+    先用本地文本相似度对全部JD排序，只对前 top_k 个调用LLM完整分析，
+    每个分析完成即推送，最后推送综合排名
+    """
+    
+    resume_service = ResumeService(db)
+    resume = resume_service.get_by_id(resume_id)
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    if resume.owner_id != current_user["id"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    if len(match_request.jds) > settings.JD_MATCH_MAX_JDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many JDs (max {settings.JD_MATCH_MAX_JDS})"
+        )
+    
+    resume_content = resume.content
+    jds = [jd.model_dump() for jd in match_request.jds]
+    
+    async def generate():
+        matching_service = BulkJDMatchingService()
+        try:
+            async for event in matching_service.stream_matches(resume_content, jds, match_request.top_k):
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            yield f"data: {json.dumps({'type': 'error', 'error': str(e)}, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(generate(), media_type="text/event-stream")
+
+@router.get("/{resume_id}/similar-jds", response_model=List[SimilarJDResponse])
+async def get_similar_jds(
+    resume_id: int,
+    top_k: int = Query(5, ge=1, le=50),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """在用户历史优化过的JD中检索与该简历最匹配的（本地向量检索，不调用LLM）"""
+    
+    resume_service = ResumeService(db)
+    resume = resume_service.get_by_id(resume_id)
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    if resume.owner_id != current_user["id"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    matches = EmbeddingService(db).similar_jds(resume, top_k)
+    return [
+        SimilarJDResponse(
+            id=record.id,
+            resume_id=record.resume_id,
+            jd_content=record.jd_content,
+            similarity=round(similarity, 4),
+            created_at=record.created_at
+        )
+        for record, similarity in matches
+    ]
+
 @router.get("/{resume_id}/optimizations")
 async def get_optimizations(
     resume_id: int,
@@ -1,20 +1,41 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.schemas.resume import ResumeCreate, ResumeResponse, ResumeUpdate
+from app.core.json_patch import JsonPatchError, apply_json_patch, apply_merge_patch
+from app.core.pagination import MAX_PAGE_SIZE, set_next_cursor
+from app.schemas.resume import ResumeCreate, ResumeResponse, ResumeSummary, ResumeUpdate, ResumeVersionInfo, ResumeVersionContent, ResumePatchResponse
 from app.services.resume_service import ResumeService
+from app.services.resume_version_service import ResumeVersionService, VersionConflictError
 from app.api.deps import get_current_user
 
 router = APIRouter()
 
-@router.get("/", response_model=List[ResumeResponse])
+JSON_PATCH_MEDIA_TYPE = "application/json-patch+json"
+MERGE_PATCH_MEDIA_TYPE = "application/merge-patch+json"
+
+@router.get("/", response_model=List[Union[ResumeResponse, ResumeSummary]])
 async def get_resumes(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = Query(None, ge=1),
+    view: str = Query("full", pattern="^(full|summary)$"),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    """获取简历列表
+
+    view=summary 时只返回摘要（不含 content）；传入 limit 时按游标分页，
+    下一页游标通过 X-Next-Cursor 响应头返回，作为下一次请求的 cursor 参数。
+    """
     resume_service = ResumeService(db)
-    resumes = resume_service.get_by_owner(current_user["id"])
+    summary = view == "summary"
+    resumes, next_cursor = resume_service.get_page_by_owner(current_user["id"], limit, cursor, summary=summary)
+    set_next_cursor(response, next_cursor)
+    
+    if summary:
+        return [ResumeSummary.model_validate(row) for row in resumes]
     return [ResumeResponse.model_validate(resume) for resume in resumes]
 
 @router.post("/", response_model=ResumeResponse)
@@ -30,6 +51,7 @@ async def create_resume(
 @router.get("/{resume_id}", response_model=ResumeResponse)
 async def get_resume(
     resume_id: int,
+    response: Response,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -49,8 +71,90 @@ async def get_resume(
             detail="Not enough permissions"
         )
     
+    # 版本令牌，供 PATCH 时通过 If-Match 做并发控制
+    response.headers["ETag"] = ResumeVersionService.version_token(resume)
     return ResumeResponse.model_validate(resume)
 
+@router.get("/{resume_id}/raw-text")
+async def get_resume_raw_text(
+    resume_id: int,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """获取简历文件提取出的原始文本（单独存储，不随简历内容返回）"""
+    resume_service = ResumeService(db)
+    resume = resume_service.get_by_id(resume_id)
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    if resume.owner_id != current_user["id"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    return {"resume_id": resume.id, "raw_text": resume.raw_text or ""}
+
+@router.get("/{resume_id}/versions", response_model=List[ResumeVersionInfo])
+async def get_resume_versions(
+    resume_id: int,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """获取简历版本列表"""
+    resume_service = ResumeService(db)
+    resume = resume_service.get_by_id(resume_id)
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    if resume.owner_id != current_user["id"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    return ResumeVersionService(db).list_versions(resume_id)
+
+@router.get("/{resume_id}/versions/{version}", response_model=ResumeVersionContent)
+async def get_resume_version(
+    resume_id: int,
+    version: int,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """获取简历某个历史版本的内容"""
+    resume_service = ResumeService(db)
+    resume = resume_service.get_by_id(resume_id)
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    if resume.owner_id != current_user["id"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    content = ResumeVersionService(db).get_content(resume_id, version)
+    if content is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume version not found"
+        )
+    
+    return ResumeVersionContent(resume_id=resume_id, version=version, content=content)
+
 @router.put("/{resume_id}", response_model=ResumeResponse)
 async def update_resume(
     resume_id: int,
@@ -84,8 +188,14 @@ async def update_resume(
             detail="No update data provided"
         )
     
-    # 更新简历
-    updated_resume = resume_service.update(resume_id, update_data)
+    # 更新简历（内容并发修改时基于最新版本重试，多次冲突返回409）
+    try:
+        updated_resume = resume_service.update(resume_id, update_data)
+    except (VersionConflictError, IntegrityError):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Resume is being modified concurrently, please retry"
+        )
     if not updated_resume:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -94,6 +204,96 @@ async def update_resume(
     
     return ResumeResponse.model_validate(updated_resume)
 
+@router.patch("/{resume_id}", response_model=ResumePatchResponse)
+async def patch_resume(
+    resume_id: int,
+    request: Request,
+    response: Response,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """增量修改简历内容
+
+    请求体为 JSON Patch (application/json-patch+json) 或 JSON Merge Patch
+    (application/merge-patch+json)，路径相对于简历 content。
+    必须携带 If-Match 版本令牌（GET /resumes/{id} 的 ETag），版本不一致时返回 412。
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type not in (JSON_PATCH_MEDIA_TYPE, MERGE_PATCH_MEDIA_TYPE):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type must be {JSON_PATCH_MEDIA_TYPE} or {MERGE_PATCH_MEDIA_TYPE}"
+        )
+    
+    try:
+        patch = await request.json()
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid JSON body"
+        )
+    
+    resume_service = ResumeService(db)
+    resume = resume_service.get_by_id(resume_id)
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    if resume.owner_id != current_user["id"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    # 乐观并发控制
+    if_match = request.headers.get("if-match")
+    if not if_match:
+        raise HTTPException(
+            status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+            detail="If-Match header with the resume version is required"
+        )
+    
+    current_token = ResumeVersionService.version_token(resume)
+    if if_match.strip() != "*" and current_token not in [token.strip() for token in if_match.split(",")]:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Resume has been modified",
+            headers={"ETag": current_token}
+        )
+    
+    try:
+        if content_type == JSON_PATCH_MEDIA_TYPE:
+            new_content = apply_json_patch(resume.content, patch)
+        else:
+            new_content = apply_merge_patch(resume.content, patch)
+    except JsonPatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    
+    if not isinstance(new_content, dict):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Resume content must remain a JSON object"
+        )
+    
+    try:
+        updated_resume = resume_service.update(resume_id, {"content": new_content}, expected_version=resume.version)
+    except (VersionConflictError, IntegrityError):
+        # 检查 If-Match 之后被其他请求修改
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Resume has been modified"
+        )
+    
+    version_token = ResumeVersionService.version_token(updated_resume)
+    response.headers["ETag"] = version_token
+    return ResumePatchResponse(version=updated_resume.version, etag=version_token)
+
 @router.delete("/{resume_id}")
 async def delete_resume(
     resume_id: int,
@@ -42,11 +42,49 @@ class Settings(BaseSettings):
     OPENROUTER_API_KEY: str = os.getenv("OPENROUTER_API_KEY", "")
     OPENROUTER_API_BASE: str = os.getenv("OPENROUTER_API_BASE", "https://openrouter.ai/api/v1")
     OPENROUTER_MODEL: str = os.getenv("OPENROUTER_MODEL", "google/gemini-2.5-flash")
+    # 结构化输出：JSON类调用是否发送 response_format（JSON Schema），服务商不支持时可关闭
+    LLM_STRUCTURED_OUTPUT: bool = os.getenv("LLM_STRUCTURED_OUTPUT", "true").lower() == "true"
+    
+    # 面试分数回填任务
+    SCORE_BACKFILL_CONCURRENCY: int = int(os.getenv("SCORE_BACKFILL_CONCURRENCY", "4"))
+    SCORE_BACKFILL_BATCH_SIZE: int = int(os.getenv("SCORE_BACKFILL_BATCH_SIZE", "50"))
+    # 已结束任务的进度保留时间（秒），过期后从任务表移除
+    SCORE_BACKFILL_JOB_TTL: int = int(os.getenv("SCORE_BACKFILL_JOB_TTL", "600"))
+    
+    # 面试统计：启用时使用按用户增量维护的汇总表，关闭时每次实时聚合
+    INTERVIEW_STATS_MATERIALIZED: bool = os.getenv("INTERVIEW_STATS_MATERIALIZED", "true").lower() == "true"
+    
+    # 导出渲染进程池
+    EXPORT_RENDER_WORKERS: int = int(os.getenv("EXPORT_RENDER_WORKERS", "2"))
+    EXPORT_RENDER_QUEUE_LIMIT: int = int(os.getenv("EXPORT_RENDER_QUEUE_LIMIT", "16"))
+    EXPORT_RENDER_TIMEOUT: float = float(os.getenv("EXPORT_RENDER_TIMEOUT", "60"))
+    EXPORT_BULK_MAX_RESUMES: int = int(os.getenv("EXPORT_BULK_MAX_RESUMES", "50"))  # 批量导出单次最多简历数
+    
+    # 批量JD匹配：单次最多JD数、LLM完整分析的并发数
+    JD_MATCH_MAX_JDS: int = int(os.getenv("JD_MATCH_MAX_JDS", "100"))
+    JD_MATCH_CONCURRENCY: int = int(os.getenv("JD_MATCH_CONCURRENCY", "4"))
+    
+    # 本地向量检索：哈希n-gram向量维度
+    EMBEDDING_DIM: int = int(os.getenv("EMBEDDING_DIM", "512"))
+    
+    # 聊天上下文筛选：简历上下文的token预算、最多检索的模块数、视为相关的最低相似度
+    CHAT_CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CHAT_CONTEXT_TOKEN_BUDGET", "800"))
+    CHAT_CONTEXT_MAX_SECTIONS: int = int(os.getenv("CHAT_CONTEXT_MAX_SECTIONS", "8"))
+    CHAT_CONTEXT_MIN_SCORE: float = float(os.getenv("CHAT_CONTEXT_MIN_SCORE", "0.05"))
+    
+    # 简历版本历史：每隔多少个版本保存一次完整快照
+    RESUME_SNAPSHOT_INTERVAL: int = int(os.getenv("RESUME_SNAPSHOT_INTERVAL", "20"))
     
     # File upload
     UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "uploads")
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
     
+    # 存储清理
+    STORAGE_SWEEP_INTERVAL: int = int(os.getenv("STORAGE_SWEEP_INTERVAL", "600"))  # 10分钟
+    EXPORT_TTL_SECONDS: int = int(os.getenv("EXPORT_TTL_SECONDS", str(7 * 24 * 3600)))  # 7天
+    EXPORT_DIR_MAX_BYTES: int = int(os.getenv("EXPORT_DIR_MAX_BYTES", str(500 * 1024 * 1024)))  # 500MB
+    UPLOAD_ORPHAN_GRACE_SECONDS: int = int(os.getenv("UPLOAD_ORPHAN_GRACE_SECONDS", "3600"))  # 1小时
+    
     model_config = {
         "case_sensitive": True,
         "env_file": ".env",
@@ -0,0 +1,177 @@
+"""
+JSON Patch (RFC 6902) 与 JSON Merge Patch (RFC 7396)
+用于简历内容的增量修改和版本差异存储
+"""
+
+import copy
+from typing import Any, Dict, List
+
+
+class JsonPatchError(ValueError):
+    """补丁格式错误或无法应用"""
+    pass
+
+
+def _escape_token(token: Any) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _parse_pointer(path: str) -> List[str]:
+    """解析 JSON Pointer (RFC 6901)"""
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer: {path}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in path[1:].split("/")]
+
+
+def _list_index(container: list, token: str, allow_end: bool = False) -> int:
+    if allow_end and token == "-":
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise JsonPatchError(f"Invalid array index: {token}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"Array index out of range: {token}")
+    return index
+
+
+def _resolve(document: Any, tokens: List[str]) -> Any:
+    """取出指针指向的值"""
+    current = document
+    for token in tokens:
+        if isinstance(current, dict):
+            if token not in current:
+                raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+            current = current[token]
+        elif isinstance(current, list):
+            current = current[_list_index(current, token)]
+        else:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+    return current
+
+
+def _add(document: Any, tokens: List[str], value: Any) -> Any:
+    if not tokens:
+        return value
+    parent = _resolve(document, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        parent[key] = value
+    elif isinstance(parent, list):
+        parent.insert(_list_index(parent, key, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add to non-container at /{'/'.join(tokens[:-1])}")
+    return document
+
+
+def _remove(document: Any, tokens: List[str]) -> Any:
+    if not tokens:
+        raise JsonPatchError("Cannot remove the document root")
+    parent = _resolve(document, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+        del parent[key]
+    elif isinstance(parent, list):
+        del parent[_list_index(parent, key)]
+    else:
+        raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+    return document
+
+
+def apply_json_patch(document: Any, operations: List[Dict[str, Any]]) -> Any:
+    """应用 RFC 6902 补丁，返回新文档（不修改传入的文档）；任一操作失败时整体失败"""
+    if not isinstance(operations, list):
+        raise JsonPatchError("JSON Patch must be an array of operations")
+
+    document = copy.deepcopy(document)
+    for operation in operations:
+        if not isinstance(operation, dict) or "op" not in operation or "path" not in operation:
+            raise JsonPatchError(f"Invalid operation: {operation}")
+
+        op = operation["op"]
+        tokens = _parse_pointer(operation["path"])
+
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise JsonPatchError(f"Operation '{op}' requires a value")
+
+        if op == "add":
+            document = _add(document, tokens, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            document = _remove(document, tokens)
+        elif op == "replace":
+            _resolve(document, tokens)
+            if tokens:
+                document = _remove(document, tokens)
+            document = _add(document, tokens, copy.deepcopy(operation["value"]))
+        elif op in ("move", "copy"):
+            if "from" not in operation:
+                raise JsonPatchError(f"Operation '{op}' requires from")
+            from_tokens = _parse_pointer(operation["from"])
+            if op == "move" and tokens[:len(from_tokens)] == from_tokens and tokens != from_tokens:
+                raise JsonPatchError("Cannot move a value into one of its children")
+            value = copy.deepcopy(_resolve(document, from_tokens))
+            if op == "move":
+                document = _remove(document, from_tokens)
+            document = _add(document, tokens, value)
+        elif op == "test":
+            if _resolve(document, tokens) != operation["value"]:
+                raise JsonPatchError(f"Test failed at {operation['path']}")
+        else:
+            raise JsonPatchError(f"Unsupported operation: {op}")
+
+    return document
+
+
+def apply_merge_patch(target: Any, patch: Any) -> Any:
+    """应用 RFC 7396 合并补丁，返回新文档：null 表示删除字段，对象递归合并，其他值直接替换"""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+
+    result = copy.deepcopy(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+
+def make_json_patch(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """生成把 old 变为 new 的 RFC 6902 补丁
+
+    对象逐字段递归比较；数组元素个数相同时逐项比较，只在末尾增删时生成 add/remove，
+    其他情况整体替换该数组。
+    """
+    if old == new:
+        return []
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        operations = []
+        for key in old:
+            if key not in new:
+                operations.append({"op": "remove", "path": f"{path}/{_escape_token(key)}"})
+        for key, value in new.items():
+            child_path = f"{path}/{_escape_token(key)}"
+            if key not in old:
+                operations.append({"op": "add", "path": child_path, "value": value})
+            else:
+                operations.extend(make_json_patch(old[key], value, child_path))
+        return operations
+
+    if isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        if old[:common] == new[:common] or len(old) == len(new):
+            operations = []
+            for index in range(common):
+                operations.extend(make_json_patch(old[index], new[index], f"{path}/{index}"))
+            # 从末尾删除，保证索引有效
+            for index in range(len(old) - 1, common - 1, -1):
+                operations.append({"op": "remove", "path": f"{path}/{index}"})
+            for value in new[common:]:
+                operations.append({"op": "add", "path": f"{path}/-", "value": value})
+            return operations
+
+    return [{"op": "replace", "path": path, "value": new}]
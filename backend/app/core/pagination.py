@@ -0,0 +1,46 @@
+"""
+列表接口的游标分页
+按主键倒序分页（主键与创建时间同序），游标为上一页最后一条记录的ID，
+翻页只需一次索引范围扫描，不会像 OFFSET 那样随页数增加变慢。
+"""
+
+from typing import Any, Callable, List, Optional, Tuple
+from fastapi import Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 100
+
+
+def keyset_page(
+    query,
+    id_column,
+    limit: Optional[int],
+    cursor: Optional[int],
+    get_id: Callable[[Any], int] = lambda row: row.id
+) -> Tuple[List[Any], Optional[int]]:
+    """执行分页查询，返回 (当前页记录, 下一页游标)；未指定 limit 和 cursor 时返回全部记录
+
+    get_id 用于从结果行中取出ID，查询多个实体时需要指定。
+    """
+    if limit is None and cursor is None:
+        return query.all(), None
+
+    if cursor is not None:
+        query = query.filter(id_column < cursor)
+    query = query.order_by(None).order_by(id_column.desc())
+
+    if limit is None:
+        return query.all(), None
+
+    # 多取一条用于判断是否还有下一页
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, get_id(rows[-1])
+    return rows, None
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[int]) -> None:
+    """通过响应头返回下一页游标，保持响应体仍为列表"""
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = str(next_cursor)
@@ -3,6 +3,9 @@ AI助手提示词管理模块
 将系统提示词与用户数据分离，便于维护和优化
 """
 
+import json
+
+
 class ResumeAssistantPrompts:
     """简历助手提示词管理类"""
     
@@ -64,6 +67,30 @@ class ResumeAssistantPrompts:
 
 请基于以上简历信息，专业地回答用户的问题。"""
 
+    # 按问题筛选后的简历上下文模板（只包含与当前问题相关的模块）
+    SELECTED_RESUME_CONTEXT_TEMPLATE = """
+## 用户简历信息
+
+以下是用户简历中与当前问题最相关的部分，请基于此信息回答用户的问题：
+
+### 基本信息
+- 姓名：{name}
+- 求职岗位：{position}
+
+{sections_text}
+{omitted_text}
+---
+
+请基于以上简历信息，专业地回答用户的问题。如需未列出部分的细节，可以请用户补充。"""
+
+    # 简历模块标题
+    RESUME_SECTION_TITLES = {
+        "skills": "技能清单",
+        "work_experience": "工作经历",
+        "projects": "项目经历",
+        "education": "教育背景"
+    }
+
     # 简历-岗位匹配分析提示词
     JD_MATCHING_PROMPT = """请分析以下简历与岗位描述的匹配度，并提供优化建议。
 
@@ -74,7 +101,41 @@ class ResumeAssistantPrompts:
 4. 简历优化建议（具体的修改建议）
 5. 关键词优化建议
 
-请用中文回答，并提供具体、可操作的建议。"""
+请用中文回答，并提供具体、可操作的建议。
+
+只返回JSON数据，不要包含任何其他文字，格式如下：
+{
+  "score": 80,
+  "matched_skills": ["匹配的技能或经验"],
+  "missing_skills": ["缺失的关键技能"],
+  "suggestions": ["具体的修改建议（含关键词优化建议）"],
+  "analysis": "完整的分析说明（Markdown格式，涵盖以上各项）"
+}"""
+
+    # 简历单个模块与岗位匹配分析提示词（增量优化时按模块调用）
+    SECTION_MATCHING_PROMPT = """请分别针对以下每个简历模块，分析其与岗位描述的匹配度，并提供该模块的优化建议。
+
+每个模块请给出：
+1. 该模块匹配度评分（0-100分）
+2. 该模块中与岗位匹配的技能和经验
+3. 该模块缺失的关键技能或信息
+4. 该模块的优化建议（具体的修改建议）
+
+请用中文回答，每个模块的建议只涉及该模块的内容。
+
+只返回JSON数据，不要包含任何其他文字，每个模块一项，section 为模块标题后括号中的字段名，格式如下：
+{
+  "sections": [
+    {
+      "section": "work_experience",
+      "score": 80,
+      "matched_skills": ["匹配的技能或经验"],
+      "missing_skills": ["缺失的关键技能或信息"],
+      "suggestions": ["具体的修改建议"],
+      "analysis": "该模块的分析说明（Markdown格式）"
+    }
+  ]
+}"""
 
     # 面试问题生成提示词
     INTERVIEW_QUESTIONS_PROMPT = """根据简历信息生成5-8个面试问题。
@@ -90,7 +151,12 @@ class ResumeAssistantPrompts:
 - 问题类型
 - 考察要点
 
-请用中文回答。"""
+请用中文回答。只返回JSON数据，不要包含任何其他文字，格式如下：
+{
+  "questions": [
+    {"question": "问题内容", "type": "background/skill/project/behavioral", "focus": "考察要点"}
+  ]
+}"""
 
     # 面试回答评估提示词
     INTERVIEW_EVALUATION_PROMPT = """作为专业面试官，请对候选人的回答做出自然的回应，就像真实面试中一样。
@@ -108,6 +174,29 @@ class ResumeAssistantPrompts:
 
 请用面试官的语气回应，然后提出下一个问题继续面试。不要给出评分或详细分析。"""
 
+    # 面试单轮处理提示词：一次调用同时完成回答评估和下一个问题生成
+    INTERVIEW_TURN_PROMPT = """作为专业面试官，请对候选人刚才的回答做出自然的回应，并给出下一个面试问题。
+
+## 任务
+1. **回应回答**：像真实面试官一样简短回应（确认、提醒或引导），不要写成分析报告
+2. **评分**：给这次回答打一个0-100的分数，考虑完整性、逻辑性、专业深度和表达清晰度
+3. **改进建议**：给出0-3条简短的改进建议
+4. **下一个问题**：基于简历和对话历史提出一个能深入了解候选人能力的后续问题，避免重复之前的问题
+
+## 输出格式
+只返回JSON数据，不要包含任何其他文字，格式如下：
+{
+  "evaluation": {
+    "feedback": "面试官对这次回答的自然回应",
+    "score": 75,
+    "suggestions": ["建议1", "建议2"]
+  },
+  "next_question": {
+    "question": "下一个问题内容",
+    "type": "follow_up"
+  }
+}"""
+
     # 面试官系统提示词 - 综合面试模式
     INTERVIEW_SYSTEM_PROMPT = """你是一位专业的AI面试官，名字叫"AI面试官"。你绝对不是简历优化师，也不提供简历优化建议。你的唯一任务是进行面试。
 
@@ -241,8 +330,88 @@ class ResumeAssistantPrompts:
         )
 
     @staticmethod
-    def build_chat_messages(user_message: str, resume_content: dict, chat_history: list = None) -> list:
-        """构建聊天消息列表，支持对话历史"""
+    def format_resume_item(section: str, item) -> str:
+        """格式化单个简历模块条目的完整内容（技能整体为一个条目）"""
+        if section == "skills" and isinstance(item, list):
+            return "\n".join(
+                f"- {skill.get('name', '未知技能')} ({skill.get('level', '未知水平')})" if isinstance(skill, dict) else f"- {skill}"
+                for skill in item
+            )
+        
+        if not isinstance(item, dict):
+            return f"- {item}"
+        
+        # 标题行：公司/项目/学校 - 职位/专业 (时间)
+        headline_keys = ("company", "name", "school", "position", "role", "major", "degree", "duration")
+        headline = " - ".join(str(item[key]) for key in ("company", "name", "school") if item.get(key))
+        subtitle = " - ".join(str(item[key]) for key in ("position", "role", "major", "degree") if item.get(key))
+        if subtitle:
+            headline = f"{headline} - {subtitle}" if headline else subtitle
+        if item.get("duration"):
+            headline = f"{headline} ({item['duration']})"
+        
+        lines = [f"- {headline}" if headline else "-"]
+        for key, value in item.items():
+            if key in headline_keys or not value:
+                continue
+            if isinstance(value, list):
+                value = "；".join(json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else str(v) for v in value)
+            elif isinstance(value, dict):
+                value = json.dumps(value, ensure_ascii=False)
+            lines.append(f"  {key}：{value}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def format_selected_resume_context(resume_content: dict, section_keys: list) -> str:
+        """格式化筛选后的简历上下文
+        
+        section_keys 为模块路径（如 skills、work_experience/0），按简历原顺序输出完整内容；
+        未选中的条目只列出名称，让模型知道它们存在
+        """
+        personal_info = resume_content.get("personal_info") or {}
+        selected = set(section_keys)
+        
+        section_parts = []
+        omitted_parts = []
+        for section, title in ResumeAssistantPrompts.RESUME_SECTION_TITLES.items():
+            value = resume_content.get(section)
+            if not value:
+                continue
+            
+            if section == "skills" or not isinstance(value, list):
+                if section in selected:
+                    section_parts.append(f"### {title}\n{ResumeAssistantPrompts.format_resume_item(section, value)}")
+                else:
+                    omitted_parts.append(title)
+                continue
+            
+            items = []
+            omitted_names = []
+            for index, item in enumerate(value):
+                if f"{section}/{index}" in selected:
+                    items.append(ResumeAssistantPrompts.format_resume_item(section, item))
+                elif isinstance(item, dict):
+                    omitted_names.append(str(item.get("company") or item.get("name") or item.get("school") or f"第{index + 1}条"))
+            if items:
+                section_parts.append(f"### {title}\n" + "\n".join(items))
+            if omitted_names:
+                omitted_parts.append(f"{title}（{'、'.join(omitted_names)}）")
+        
+        omitted_text = f"\n（已省略与当前问题关系不大的内容：{'；'.join(omitted_parts)}）\n" if omitted_parts else ""
+        
+        return ResumeAssistantPrompts.SELECTED_RESUME_CONTEXT_TEMPLATE.format(
+            name=personal_info.get("name", "未提供"),
+            position=personal_info.get("position", "未提供"),
+            sections_text="\n\n".join(section_parts),
+            omitted_text=omitted_text
+        )
+
+    @staticmethod
+    def build_chat_messages(user_message: str, resume_content: dict, chat_history: list = None, resume_context: str = None) -> list:
+        """构建聊天消息列表，支持对话历史
+        
+        resume_context 为按问题筛选后的简历上下文，未提供时使用完整简历上下文
+        """
         
         # 系统提示词
         system_message = {
@@ -251,7 +420,8 @@ class ResumeAssistantPrompts:
         }
         
         # 简历上下文信息
-        resume_context = ResumeAssistantPrompts.format_resume_context(resume_content)
+        if resume_context is None:
+            resume_context = ResumeAssistantPrompts.format_resume_context(resume_content)
         context_message = {
             "role": "user",
             "content": resume_context
@@ -390,6 +560,36 @@ class ResumeAssistantPrompts:
 简历内容：
 {resume_context}
 
+岗位描述：
+{jd_content}"""
+        
+        user_message = {
+            "role": "user",
+            "content": analysis_prompt
+        }
+        
+        return [system_message, user_message]
+
+    @staticmethod
+    def build_sections_analysis_messages(sections: dict, jd_content: str, resume_overview: str = "") -> list:
+        """构建多个简历模块与岗位匹配分析消息，sections 为 模块字段名 -> (模块标题, 模块内容)"""
+        
+        system_message = {
+            "role": "system",
+            "content": "你是一个专业的HR顾问和简历优化专家，擅长分析简历与岗位要求的匹配度并提供优化建议。"
+        }
+        
+        sections_text = "\n\n".join(
+            f"简历模块：{title}（{section}）\n{json.dumps(content, ensure_ascii=False, indent=2)}"
+            for section, (title, content) in sections.items()
+        )
+        
+        analysis_prompt = f"""{ResumeAssistantPrompts.SECTION_MATCHING_PROMPT}
+
+候选人概况：{resume_overview or "未提供"}
+
+{sections_text}
+
 岗位描述：
 {jd_content}"""
         
@@ -450,4 +650,38 @@ class ResumeAssistantPrompts:
             "content": evaluation_prompt
         }
         
-        return [system_message, user_message]
\ No newline at end of file
+        return [system_message, user_message]
+
+    @staticmethod
+    def build_interview_turn_messages(question: str, answer: str, conversation_history: list, resume_content: dict) -> list:
+        """构建面试单轮处理消息（回答评估 + 下一个问题生成）"""
+        
+        system_message = {
+            "role": "system",
+            "content": "你是一位专业的面试官，正在进行真实的面试对话。你需要回应候选人的回答、给出评分，并提出下一个深入的问题。"
+        }
+        
+        resume_context = ResumeAssistantPrompts.format_resume_context(resume_content)
+        
+        history_text = "\n".join([
+            f"问题：{item['question']}\n回答：{item['answer']}"
+            for item in conversation_history
+        ]) if conversation_history else "暂无"
+        
+        turn_prompt = f"""{ResumeAssistantPrompts.INTERVIEW_TURN_PROMPT}
+
+之前的对话：
+{history_text}
+
+当前问题：{question}
+候选人回答：{answer}
+
+候选人简历信息：
+{resume_context}"""
+        
+        user_message = {
+            "role": "user",
+            "content": turn_prompt
+        }
+        
+        return [system_message, user_message]
@@ -0,0 +1,164 @@
+"""
+LLM结构化输出
+生成 response_format 的 JSON Schema 约束，本地修复常见的JSON格式问题（代码块标记、前后说明文字、
+尾逗号、字符串中的换行、输出被截断），再用 pydantic 模型校验，尽量避免为格式问题重新调用LLM
+"""
+
+import copy
+import json
+from typing import Any, Dict, List, Type, TypeVar
+from pydantic import BaseModel, ValidationError
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class StructuredOutputError(ValueError):
+    """LLM输出无法解析为JSON或不符合结果模型"""
+    pass
+
+
+def _strict_schema(schema: Any) -> Any:
+    """调整为严格模式要求的Schema：对象的所有字段必填且不允许额外字段，去掉默认值"""
+    if isinstance(schema, dict):
+        schema = {key: _strict_schema(value) for key, value in schema.items() if key != "default"}
+        if schema.get("type") == "object" and "properties" in schema:
+            schema["required"] = list(schema["properties"].keys())
+            schema["additionalProperties"] = False
+        return schema
+    if isinstance(schema, list):
+        return [_strict_schema(item) for item in schema]
+    return schema
+
+
+def json_schema_response_format(model: Type[BaseModel], name: str) -> Dict[str, Any]:
+    """根据结果模型生成 response_format（OpenAI兼容的 json_schema 格式）"""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "strict": True,
+            "schema": _strict_schema(copy.deepcopy(model.model_json_schema()))
+        }
+    }
+
+
+def extract_json_text(content: str) -> str:
+    """去掉BOM、markdown代码块标记和JSON前面的说明文字"""
+    text = (content or "").strip().lstrip("\ufeff")
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else text[3:]
+        if text.rstrip().endswith("```"):
+            text = text.rstrip()[:-3]
+
+    starts = [index for index in (text.find("{"), text.find("[")) if index != -1]
+    start = min(starts) if starts else -1
+    return text[start:].strip() if start != -1 else text.strip()
+
+
+def _close(text: str, closers: List[str]) -> str:
+    """去掉结尾的逗号并按顺序补全未闭合的括号"""
+    text = text.rstrip()
+    if text.endswith(","):
+        text = text[:-1]
+    return text + "".join(reversed(closers))
+
+
+def repair_json(content: str) -> str:
+    """修复常见的JSON格式问题，返回修复后的JSON文本（不保证一定可以解析）"""
+    text = extract_json_text(content)
+
+    out: List[str] = []
+    # 每个未闭合的容器：闭合符、开括号在 out 中的位置、该层逗号在 out 中的位置
+    containers: List[Dict[str, Any]] = []
+    in_string = False
+    escape = False
+
+    for char in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            elif char == "\n":
+                char = "\\n"
+            elif char == "\r":
+                char = "\\r"
+            elif char == "\t":
+                char = "\\t"
+            out.append(char)
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            containers.append({"closer": "}" if char == "{" else "]", "start": len(out), "commas": []})
+        elif char in "}]":
+            if not containers or containers[-1]["closer"] != char:
+                continue  # 多余或不匹配的闭合符
+            # 尾逗号
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+            containers.pop()
+            out.append(char)
+            if not containers:
+                break  # 顶层结束，忽略后面的说明文字
+            continue
+        elif char == "," and containers:
+            containers[-1]["commas"].append(len(out))
+        out.append(char)
+
+    if not containers:
+        return "".join(out)
+
+    # 输出被截断：先补全当前字符串和括号，仍无法解析时逐个丢弃最内层容器中不完整的最后一个元素
+    tail = "".join(out)
+    if escape:
+        tail = tail[:-1]
+    if in_string:
+        tail += '"'
+    closers = [container["closer"] for container in containers]
+    candidate = _close(tail, closers)
+    if _loads_ok(candidate):
+        return candidate
+
+    innermost = containers[-1]
+    for cut in list(reversed(innermost["commas"])) + [innermost["start"] + 1]:
+        candidate = _close("".join(out[:cut]), closers)
+        if _loads_ok(candidate):
+            return candidate
+    return candidate
+
+
+def _loads_ok(text: str) -> bool:
+    try:
+        json.loads(text)
+        return True
+    except json.JSONDecodeError:
+        return False
+
+
+def parse_json_loose(content: str) -> Any:
+    """解析LLM返回的JSON，直接解析失败时先在本地修复"""
+    try:
+        return json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        pass
+
+    repaired = repair_json(content or "")
+    try:
+        return json.loads(repaired)
+    except json.JSONDecodeError as e:
+        raise StructuredOutputError(f"Invalid JSON: {e}") from e
+
+
+def parse_structured(content: str, model: Type[ModelT]) -> ModelT:
+    """解析并按结果模型校验LLM输出"""
+    data = parse_json_loose(content)
+    try:
+        return model.model_validate(data)
+    except ValidationError as e:
+        raise StructuredOutputError(f"Output does not match {model.__name__}: {e}") from e
@@ -3,6 +3,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.api_v1.api import api_router
 from app.core.database import engine, Base
+from app.services.render_pool import render_pool
+from app.services.storage_sweeper import storage_sweeper
+import asyncio
 import logging
 
 # 配置日志
@@ -109,6 +112,23 @@ else:
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("startup")
+async def start_storage_sweeper():
+    storage_sweeper.start()
+
+@app.on_event("startup")
+async def warm_up_render_pool():
+    try:
+        await render_pool.warm_up()
+    except Exception as e:
+        # 预热失败不影响启动，渲染进程会在首次导出时按需创建
+        logger.warning(f"导出渲染进程预热失败: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_background_workers():
+    storage_sweeper.stop()
+    render_pool.shutdown()
+
 @app.get("/")
 async def root():
     return {"message": "Chat Resume API"}
@@ -117,6 +137,11 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/storage")
+async def storage_health():
+    usage = await asyncio.to_thread(storage_sweeper.disk_usage)
+    return {"usage": usage, "last_sweep": storage_sweeper.last_run}
+
 @app.get("/api/v1/test")
 async def test_endpoint():
     return {"message": "API is working", "cors": "enabled"}
@@ -1,2 +1,2 @@
 from .user import User
-from .resume import Resume, OptimizationRecord, InterviewSession
\ No newline at end of file
+from .resume import Resume, ResumeVersion, OptimizationRecord, InterviewSession, InterviewTurn, UserInterviewStats, ContentEmbedding
\ No newline at end of file
@@ -1,5 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, ForeignKey
-from sqlalchemy.orm import relationship
+import zlib
+from typing import Optional
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, ForeignKey, Index, LargeBinary, UniqueConstraint, text
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -8,10 +10,12 @@ class Resume(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
-    content = Column(JSON, nullable=False)  # 结构化简历内容
+    content = Column(JSON, nullable=False)  # 结构化简历内容（不含原始文本）
+    raw_text_compressed = deferred(Column("raw_text", LargeBinary, nullable=True))  # zlib压缩的原始文本，访问时才加载
     original_filename = Column(String, nullable=True)
     file_path = Column(String, nullable=True)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # 内容版本号，每次内容变化加1
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -19,12 +23,37 @@ class Resume(Base):
     owner = relationship("User", back_populates="resumes")
     optimization_records = relationship("OptimizationRecord", back_populates="resume")
     interview_sessions = relationship("InterviewSession", back_populates="resume")
+    
+    @property
+    def raw_text(self) -> Optional[str]:
+        """简历文件提取出的原始文本"""
+        if self.raw_text_compressed is None:
+            return None
+        return zlib.decompress(self.raw_text_compressed).decode("utf-8")
+    
+    @raw_text.setter
+    def raw_text(self, value: Optional[str]) -> None:
+        self.raw_text_compressed = zlib.compress(value.encode("utf-8")) if value else None
+
+class ResumeVersion(Base):
+    """简历内容版本：定期保存完整快照，其余版本只保存相对上一版本的 JSON Patch"""
+    __tablename__ = "resume_versions"
+    __table_args__ = (
+        UniqueConstraint("resume_id", "version", name="uq_resume_versions_resume_version"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
+    version = Column(Integer, nullable=False)
+    snapshot = Column(JSON(none_as_null=True), nullable=True)  # 完整内容（快照版本）
+    patch = Column(JSON(none_as_null=True), nullable=True)     # RFC 6902 补丁（增量版本）
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 class OptimizationRecord(Base):
     __tablename__ = "optimization_records"
 
     id = Column(Integer, primary_key=True, index=True)
-    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
+    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False, index=True)
     jd_content = Column(Text, nullable=False)
     suggestions = Column(JSON, nullable=False)
     applied = Column(JSON, nullable=True)  # 用户应用的建议
@@ -35,19 +64,131 @@ class OptimizationRecord(Base):
 
 class InterviewSession(Base):
     __tablename__ = "interview_sessions"
+    __table_args__ = (
+        # 按简历查找进行中的会话（开始面试、清理重复会话）
+        Index("ix_interview_sessions_resume_id_status", "resume_id", "status"),
+        # 分数回填：只索引已完成但尚无分数的会话
+        Index(
+            "ix_interview_sessions_unscored",
+            "resume_id",
+            "id",
+            postgresql_where=text("status = 'completed' AND overall_score IS NULL"),
+            sqlite_where=text("status = 'completed' AND overall_score IS NULL")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
     job_position = Column(String, nullable=True)  # 面试职位
     interview_mode = Column(String, nullable=True)  # 面试模式: comprehensive, technical, behavioral
     jd_content = Column(Text, nullable=True)  # 职位描述
-    questions = Column(JSON, nullable=False)  # 问题列表
-    answers = Column(JSON, nullable=False)    # 答案列表
+    # 旧版问题/答案JSON列表，数据已迁移到 interview_turns，新会话保持为空列表
+    legacy_questions = Column("questions", JSON, nullable=False, default=list)
+    legacy_answers = Column("answers", JSON, nullable=False, default=list)
     feedback = Column(JSON, nullable=True)    # AI反馈
     status = Column(String, default="active")  # active, completed, paused
     overall_score = Column(Integer, nullable=True)  # 面试整体分数 (0-100)
+    prefetched_question = Column(JSON, nullable=True)  # 预生成的下一个追问问题
+    score_summary = Column(JSON, nullable=True)  # 逐题累积的分数和能力信号
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    resume = relationship("Resume", back_populates="interview_sessions")
\ No newline at end of file
+    resume = relationship("Resume", back_populates="interview_sessions")
+    turns = relationship(
+        "InterviewTurn",
+        back_populates="session",
+        order_by="InterviewTurn.question_index",
+        cascade="all, delete-orphan"
+    )
+    
+    @property
+    def questions(self) -> list:
+        """问题列表：[{"question", "type"}]，按问题序号排列"""
+        return [turn.to_question() for turn in self.turns]
+    
+    @property
+    def answers(self) -> list:
+        """答案列表，按问题序号排列到最后一个已回答的问题，中间未回答的位置为空字典"""
+        answers = [turn.to_answer() for turn in self.turns]
+        while answers and not answers[-1]:
+            answers.pop()
+        return answers
+    
+    def get_turn(self, question_index: int):
+        """按问题序号获取轮次"""
+        for turn in self.turns:
+            if turn.question_index == question_index:
+                return turn
+        return None
+    
+    def add_turn(self, question: dict, question_index: int):
+        """追加一个新问题（只插入一行，不改写已有轮次）"""
+        turn = InterviewTurn(
+            question_index=question_index,
+            question=question["question"],
+            question_type=question.get("type") or "general"
+        )
+        self.turns.append(turn)
+        return turn
+
+class InterviewTurn(Base):
+    """面试轮次：每个问题一行，回答和评估在提交答案时写入一次"""
+    __tablename__ = "interview_turns"
+    __table_args__ = (
+        UniqueConstraint("session_id", "question_index", name="uq_interview_turns_session_question"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(Integer, ForeignKey("interview_sessions.id"), nullable=False)
+    question_index = Column(Integer, nullable=False)
+    question = Column(Text, nullable=False)
+    question_type = Column(String, nullable=False, default="general")
+    answer = Column(Text, nullable=True)
+    evaluation = Column(JSON, nullable=True)
+    score = Column(Integer, nullable=True)  # 评估分数，便于按题统计
+    asked_at = Column(DateTime(timezone=True), server_default=func.now())
+    answered_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Relationships
+    session = relationship("InterviewSession", back_populates="turns")
+    
+    def to_question(self) -> dict:
+        return {"question": self.question, "type": self.question_type}
+    
+    def to_answer(self) -> dict:
+        if self.answer is None:
+            return {}
+        return {
+            "answer": self.answer,
+            "evaluation": self.evaluation,
+            "question_index": self.question_index
+        }
+
+class UserInterviewStats(Base):
+    """每个用户的面试统计汇总，随会话创建和状态变化增量更新"""
+    __tablename__ = "user_interview_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total_count = Column(Integer, nullable=False, default=0)
+    completed_count = Column(Integer, nullable=False, default=0)
+    active_count = Column(Integer, nullable=False, default=0)
+    scored_count = Column(Integer, nullable=False, default=0)  # 有整体分数的会话数
+    score_sum = Column(Integer, nullable=False, default=0)     # 整体分数之和，用于计算平均分
+    recent_scores = Column(JSON, nullable=False, default=list)  # 最近的整体分数（按时间先后），用于分数趋势
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class ContentEmbedding(Base):
+    """简历模块和JD的本地向量（float16），内容变化时重新计算"""
+    __tablename__ = "content_embeddings"
+    __table_args__ = (
+        UniqueConstraint("source_type", "source_id", "section", name="uq_content_embeddings_source_section"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_type = Column(String(20), nullable=False)  # resume（简历模块）或 jd（优化记录中的JD）
+    source_id = Column(Integer, nullable=False)       # 简历ID或优化记录ID
+    section = Column(String, nullable=False)          # 模块路径，如 skills、work_experience/0；JD固定为 jd
+    content_hash = Column(String(64), nullable=False)
+    vector = Column(LargeBinary, nullable=False)      # float16 向量字节
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,11 +1,21 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Dict, Any, List
 
 class ExportRequest(BaseModel):
     format: str  # pdf, docx, html
     template: Optional[str] = "default"
+    inline: bool = False  # 为True时直接在响应中返回文件内容，不生成下载链接
 
 class ExportResponse(BaseModel):
     download_url: str
     filename: str
-    format: str
\ No newline at end of file
+    format: str
+
+class ExportPreviewRequest(BaseModel):
+    template: Optional[str] = "default"
+    content: Optional[Dict[str, Any]] = None  # 编辑器中未保存的内容，为空时使用已保存的简历
+
+class BulkExportRequest(BaseModel):
+    resume_ids: List[int]
+    formats: List[str] = ["pdf"]  # 每份简历导出的格式，可同时导出多种
+    template: Optional[str] = "default"
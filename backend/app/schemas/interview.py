@@ -1,6 +1,6 @@
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class InterviewSessionCreate(BaseModel):
     job_position: Optional[str] = None
@@ -10,6 +10,7 @@ class InterviewSessionCreate(BaseModel):
 class InterviewSessionResponse(BaseModel):
     id: int
     resume_id: int
+    resume_title: Optional[str] = None  # 跨简历的会话列表中返回
     job_position: Optional[str] = None
     interview_mode: Optional[str] = None
     jd_content: Optional[str] = None
@@ -22,6 +23,22 @@ class InterviewSessionResponse(BaseModel):
     
     model_config = {"from_attributes": True}
 
+class InterviewSessionSummary(BaseModel):
+    """面试会话列表摘要，不含问题、回答和反馈，完整内容通过详情接口获取"""
+    id: int
+    resume_id: int
+    resume_title: Optional[str] = None
+    job_position: Optional[str] = None
+    interview_mode: Optional[str] = None
+    status: str
+    overall_score: Optional[int] = None
+    question_count: int = 0
+    answer_count: int = 0
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    
+    model_config = {"from_attributes": True}
+
 class InterviewQuestionResponse(BaseModel):
     question: str
     question_type: str
@@ -35,6 +52,49 @@ class InterviewEvaluationResponse(BaseModel):
     question: str
     answer: str
     evaluation: Dict[str, Any]
-    score: int
+    score: Optional[int] = None  # 0-100；没有结构化评分时为空
     feedback: str
-    suggestions: List[str]
\ No newline at end of file
+    suggestions: List[str]
+
+class InterviewTurnEvaluation(BaseModel):
+    feedback: str
+    score: int = Field(ge=0, le=100)
+    suggestions: List[str] = []
+
+class InterviewTurnQuestion(BaseModel):
+    question: str = Field(min_length=1)
+    type: str = "follow_up"
+
+class InterviewTurnResult(BaseModel):
+    """单次LLM调用返回的面试轮次结果：回答评估 + 下一个问题"""
+    evaluation: InterviewTurnEvaluation
+    next_question: InterviewTurnQuestion
+
+class GeneratedInterviewQuestion(BaseModel):
+    question: str = Field(min_length=1)
+    type: str = "general"
+    focus: Optional[str] = None  # 考察要点
+
+class InterviewQuestionList(BaseModel):
+    """面试问题生成结果"""
+    questions: List[GeneratedInterviewQuestion]
+
+class CompetencyScores(BaseModel):
+    """面试报告能力维度评分（0-100）"""
+    job_fit: int = 75
+    technical_depth: int = 75
+    project_exposition: int = 75
+    communication: int = 75
+    behavioral: int = 75
+
+class InterviewFeedback(BaseModel):
+    """面试报告总体反馈"""
+    highlights: List[str] = []
+    improvements: List[str] = []
+
+class QAEvaluation(BaseModel):
+    """面试报告单个问答评估"""
+    score: int = 7
+    strengths: List[str] = []
+    suggestions: List[str] = []
+    reference_answer: Optional[str] = None
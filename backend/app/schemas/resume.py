@@ -1,6 +1,6 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class ResumeCreate(BaseModel):
     title: str
@@ -18,14 +18,57 @@ class ResumeResponse(BaseModel):
     content: Dict[str, Any]
     original_filename: Optional[str] = None
     owner_id: int
+    version: int = 1
     created_at: datetime
     updated_at: Optional[datetime] = None
     
     model_config = {"from_attributes": True}
 
+class ResumeSummary(BaseModel):
+    """简历列表摘要，不含 content，完整内容通过详情接口获取"""
+    id: int
+    title: str
+    original_filename: Optional[str] = None
+    owner_id: int
+    version: int = 1
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    
+    model_config = {"from_attributes": True}
+
+class ResumeVersionInfo(BaseModel):
+    version: int
+    kind: str  # snapshot, patch
+    created_at: Optional[datetime] = None
+
+class ResumeVersionContent(BaseModel):
+    resume_id: int
+    version: int
+    content: Dict[str, Any]
+
+class ResumePatchResponse(BaseModel):
+    version: int
+    etag: str  # 下一次 PATCH 使用的 If-Match 值
+
 class OptimizationRequest(BaseModel):
     jd_content: str
 
+class JDMatchItem(BaseModel):
+    id: Optional[str] = None     # 调用方自定义的JD标识，原样返回
+    title: Optional[str] = None
+    content: str = Field(min_length=1)
+
+class BulkJDMatchRequest(BaseModel):
+    jds: List[JDMatchItem] = Field(min_length=1)
+    top_k: int = Field(default=5, ge=1, le=20)  # 进行LLM完整分析的候选数
+
+class SimilarJDResponse(BaseModel):
+    id: int                  # 优化记录ID
+    resume_id: int
+    jd_content: str
+    similarity: float        # 余弦相似度
+    created_at: datetime
+
 class OptimizationResponse(BaseModel):
     id: int
     resume_id: int
@@ -33,4 +76,67 @@ class OptimizationResponse(BaseModel):
     suggestions: Dict[str, Any]
     created_at: datetime
     
-    model_config = {"from_attributes": True}
\ No newline at end of file
+    model_config = {"from_attributes": True}
+
+
+# AI简历解析结果（字段均可缺省，缺省字段在后续校验中补全）
+class ParsedPersonalInfo(BaseModel):
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    position: Optional[str] = None
+    github: Optional[str] = None
+    linkedin: Optional[str] = None
+    website: Optional[str] = None
+    address: Optional[str] = None
+
+class ParsedEducation(BaseModel):
+    school: Optional[str] = None
+    major: Optional[str] = None
+    degree: Optional[str] = None
+    duration: Optional[str] = None
+    description: Optional[str] = None
+
+class ParsedWorkExperience(BaseModel):
+    company: Optional[str] = None
+    position: Optional[str] = None
+    duration: Optional[str] = None
+    description: Optional[str] = None
+
+class ParsedSkill(BaseModel):
+    name: Optional[str] = None
+    level: Optional[str] = None
+    category: Optional[str] = None
+
+class ParsedProject(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    technologies: List[str] = []
+    role: Optional[str] = None
+    duration: Optional[str] = None
+    github_url: Optional[str] = None
+    demo_url: Optional[str] = None
+    achievements: List[str] = []
+
+class ParsedResume(BaseModel):
+    personal_info: ParsedPersonalInfo = ParsedPersonalInfo()
+    education: List[ParsedEducation] = []
+    work_experience: List[ParsedWorkExperience] = []
+    skills: List[Union[ParsedSkill, str]] = []
+    projects: List[ParsedProject] = []
+
+class ResumeMatchAnalysis(BaseModel):
+    """简历（或单个模块）与JD匹配分析的结构化结果"""
+    score: int = Field(default=0, ge=0, le=100)
+    matched_skills: List[str] = []
+    missing_skills: List[str] = []
+    suggestions: List[str] = []
+    analysis: str = ""  # 完整的分析说明（Markdown）
+
+class SectionMatchAnalysis(ResumeMatchAnalysis):
+    """单个简历模块的匹配分析结果"""
+    section: str  # 模块字段名，如 work_experience
+
+class ResumeSectionsMatchAnalysis(BaseModel):
+    """多个简历模块一次分析的结构化结果"""
+    sections: List[SectionMatchAnalysis] = []
@@ -0,0 +1,108 @@
+"""
+批量导出服务
+多份简历在渲染进程池中并发渲染，每完成一个文件就写入ZIP并立即输出，首批数据无需等待全部渲染完成
+"""
+
+import asyncio
+import re
+import zipfile
+from typing import Any, AsyncIterator, Dict, List, Tuple
+from app.services.render_pool import render_pool
+
+# 本身已压缩的格式直接存储，避免重复压缩浪费CPU
+STORED_FORMATS = {"pdf", "docx"}
+
+
+class _ZipStreamBuffer:
+    """供 zipfile 写入的只追加缓冲区，不支持 seek，zipfile 会改用数据描述符写法"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        """取出已写入的数据"""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class BulkExportService:
+    """批量导出：并发渲染 + 流式ZIP"""
+
+    def build_entry_name(self, resume_id: int, title: str, export_format: str) -> str:
+        """生成ZIP内的文件名：<简历ID>_<标题>.<格式>"""
+        safe_title = re.sub(r'[\\/:*?"<>|\s]+', '_', title or '').strip('_')[:50] or "resume"
+        return f"{resume_id}_{safe_title}.{export_format}"
+
+    async def _render_entry(self, semaphore: asyncio.Semaphore, entry: Dict[str, Any], template: str) -> Tuple[Dict[str, Any], bytes]:
+        """渲染单个文件；相同内容已导出过时直接读取缓存文件"""
+        async with semaphore:
+            filepath = await render_pool.render(entry["content"], entry["format"], template)
+        data = await asyncio.to_thread(self._read_file, filepath)
+        return entry, data
+
+    def _read_file(self, filepath: str) -> bytes:
+        with open(filepath, "rb") as f:
+            return f.read()
+
+    async def stream_zip(self, resumes: List[Dict[str, Any]], formats: List[str], template: str = "default") -> AsyncIterator[bytes]:
+        """按渲染完成顺序逐个写入ZIP条目并输出
+
+        Args:
+            resumes: [{"id", "title", "content"}]，调用方需已完成权限校验
+            formats: 导出格式列表
+        单个文件渲染失败不会中断整个压缩包，失败信息写入 export_errors.txt。
+        """
+        entries = [
+            {
+                "name": self.build_entry_name(resume["id"], resume["title"], export_format),
+                "format": export_format,
+                "content": resume["content"]
+            }
+            for resume in resumes
+            for export_format in formats
+        ]
+
+        # 并发数不超过渲染进程数，避免一次请求占满渲染队列
+        semaphore = asyncio.Semaphore(render_pool.max_workers)
+        tasks = [asyncio.create_task(self._render_entry(semaphore, entry, template)) for entry in entries]
+        task_entries = dict(zip(tasks, entries))
+
+        buffer = _ZipStreamBuffer()
+        errors = []
+        try:
+            with zipfile.ZipFile(buffer, mode="w") as archive:
+                pending = set(tasks)
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        try:
+                            entry, data = task.result()
+                        except Exception as e:
+                            errors.append(f"{task_entries[task]['name']}: {e}")
+                            continue
+
+                        compression = zipfile.ZIP_STORED if entry["format"] in STORED_FORMATS else zipfile.ZIP_DEFLATED
+                        archive.writestr(entry["name"], data, compress_type=compression)
+                        yield buffer.drain()
+
+                if errors:
+                    archive.writestr("export_errors.txt", "\n".join(errors), compress_type=zipfile.ZIP_DEFLATED)
+
+            # 关闭压缩包时写入中央目录
+            yield buffer.drain()
+        finally:
+            # 客户端中途断开时取消尚未完成的渲染
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+
+bulk_export_service = BulkExportService()
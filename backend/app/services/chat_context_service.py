@@ -0,0 +1,71 @@
+"""
+聊天上下文筛选服务
+按用户问题检索简历模块（技能、每段工作经历、每个项目等），只把最相关的模块在token预算内发给模型；
+简历较短、问题与具体模块无关或筛选结果不比完整上下文更短时使用完整上下文
+"""
+
+import logging
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.prompts import ResumeAssistantPrompts
+from app.models.resume import Resume
+from app.services.embedding_service import EmbeddingService
+from app.services.openrouter_service import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class ChatContextService:
+    """为聊天选择简历上下文"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def build_context(self, resume: Resume, user_message: str, chat_history: Optional[list] = None) -> str:
+        """返回发给模型的简历上下文"""
+        resume_content = resume.content or {}
+        full_context = ResumeAssistantPrompts.format_resume_context(resume_content)
+        budget = settings.CHAT_CONTEXT_TOKEN_BUDGET
+        if estimate_tokens(full_context) <= budget:
+            return full_context
+
+        matches = EmbeddingService(self.db).search_resume_sections(
+            resume,
+            self._query_text(user_message, chat_history),
+            top_k=settings.CHAT_CONTEXT_MAX_SECTIONS
+        )
+        # 基本信息始终在模板中，不参与筛选
+        relevant = [
+            section for section, score in matches
+            if score >= settings.CHAT_CONTEXT_MIN_SCORE and section != "personal_info"
+        ]
+        if not relevant:
+            return full_context
+
+        # 按相关度依次尝试加入模块，以渲染后的完整上下文（含模板和省略列表）计算token
+        selected: List[str] = []
+        context = None
+        for section in relevant:
+            candidate = ResumeAssistantPrompts.format_selected_resume_context(resume_content, selected + [section])
+            if estimate_tokens(candidate) <= budget:
+                selected.append(section)
+                context = candidate
+
+        if context is None:
+            return full_context
+        context_tokens = estimate_tokens(context)
+        full_tokens = estimate_tokens(full_context)
+        if context_tokens >= full_tokens:
+            return full_context
+
+        logger.debug("聊天上下文筛选：简历 %s 选中 %s，约 %s tokens（完整上下文约 %s tokens）", resume.id, selected, context_tokens, full_tokens)
+        return context
+
+    def _query_text(self, user_message: str, chat_history: Optional[list]) -> str:
+        """检索用的查询文本：当前问题加上一条用户消息，便于处理“这个项目呢”之类的追问"""
+        previous = [
+            msg.get("content", "") for msg in (chat_history or [])
+            if isinstance(msg, dict) and msg.get("type") == "user"
+        ]
+        return "\n".join(previous[-1:] + [user_message])
@@ -0,0 +1,242 @@
+"""
+本地向量检索服务
+用哈希n-gram把简历模块和JD转成定长向量（纯CPU，无需模型文件），以float16保存，
+按余弦相似度检索最相关的模块或JD
+"""
+
+import hashlib
+import math
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.resume import ContentEmbedding, OptimizationRecord, Resume
+from app.services.text_similarity import flatten_text, tokenize
+
+SOURCE_RESUME = "resume"
+SOURCE_JD = "jd"
+JD_SECTION = "jd"
+
+# 特征或哈希方式变化时更新，使已保存的向量失效
+EMBEDDING_VERSION = "1"
+
+# 列表类模块按条目拆分，其余模块整体作为一段
+LIST_SECTIONS = ("work_experience", "projects", "education")
+WHOLE_SECTIONS = ("personal_info", "skills")
+
+TRIGRAM_WEIGHT = 0.5  # 英文单词字符三元组的权重，用于匹配词形变化
+
+
+def resume_sections(content: Dict[str, Any]) -> Dict[str, str]:
+    """把简历内容拆成可检索的模块：技能、每段工作经历、每个项目等，键为模块路径"""
+    sections = {}
+    for name in WHOLE_SECTIONS:
+        text = flatten_text(content.get(name)).strip()
+        if text:
+            sections[name] = text
+    for name in LIST_SECTIONS:
+        items = content.get(name)
+        if not isinstance(items, list):
+            continue
+        for index, item in enumerate(items):
+            text = flatten_text(item).strip()
+            if text:
+                sections[f"{name}/{index}"] = text
+    return sections
+
+
+def _features(text: str) -> Counter:
+    """词项特征及权重：中文字二元组和英文单词，另加英文单词的字符三元组"""
+    features = Counter()
+    for token in tokenize(text):
+        features["w:" + token] += 1
+        if len(token) >= 4 and token.isascii():
+            padded = f"#{token}#"
+            for i in range(len(padded) - 2):
+                features["c:" + padded[i:i + 3]] += TRIGRAM_WEIGHT
+    return features
+
+
+def embed_text(text: str, dim: Optional[int] = None) -> np.ndarray:
+    """哈希n-gram向量（带符号特征哈希，次线性词频），L2归一化后以float16返回"""
+    dim = dim or settings.EMBEDDING_DIM
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature, weight in _features(text).items():
+        digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+        sign = -1.0 if digest >> 63 else 1.0
+        vector[digest % dim] += sign * (1 + math.log(weight) if weight >= 1 else weight)
+
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    return vector.astype(np.float16)
+
+
+class EmbeddingIndex:
+    """float16 矩阵支撑的内存索引，每行一个归一化向量"""
+
+    def __init__(self, keys: Sequence[Any], vectors: np.ndarray):
+        self.keys = list(keys)
+        self.vectors = vectors
+
+    @classmethod
+    def from_bytes(cls, items: Sequence[Tuple[Any, bytes]], dim: int) -> "EmbeddingIndex":
+        keys = [key for key, _ in items]
+        if not items:
+            return cls(keys, np.zeros((0, dim), dtype=np.float16))
+        vectors = np.frombuffer(b"".join(data for _, data in items), dtype=np.float16).reshape(len(items), dim)
+        return cls(keys, vectors)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def search(self, query_vector: np.ndarray, top_k: int) -> List[Tuple[Any, float]]:
+        """余弦相似度最高的 top_k 项（向量均已归一化，点积即余弦），按相似度降序"""
+        if not self.keys or top_k <= 0:
+            return []
+
+        scores = self.vectors.astype(np.float32) @ query_vector.astype(np.float32)
+        top_k = min(top_k, len(self.keys))
+        indices = np.argpartition(-scores, top_k - 1)[:top_k]
+        indices = indices[np.argsort(-scores[indices])]
+        return [(self.keys[i], float(scores[i])) for i in indices]
+
+
+class EmbeddingService:
+    """简历模块与JD向量的写入和检索，写入方法由调用方负责提交事务"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.dim = settings.EMBEDDING_DIM
+
+    def content_hash(self, text: str) -> str:
+        payload = f"{EMBEDDING_VERSION}:{self.dim}:{text}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def index_resume(self, resume: Resume) -> None:
+        """按模块更新简历向量，内容未变化的模块不重新计算"""
+        self._sync(SOURCE_RESUME, resume.id, resume_sections(resume.content or {}))
+
+    def index_jd(self, record: OptimizationRecord) -> None:
+        """保存优化记录中JD的向量"""
+        self._sync(SOURCE_JD, record.id, {JD_SECTION: record.jd_content})
+
+    def delete_for_resume(self, resume_id: int) -> None:
+        """删除简历模块向量及其优化记录的JD向量"""
+        record_ids = self.db.query(OptimizationRecord.id).filter(OptimizationRecord.resume_id == resume_id)
+        self.db.query(ContentEmbedding).filter(
+            ContentEmbedding.source_type == SOURCE_JD,
+            ContentEmbedding.source_id.in_(record_ids.scalar_subquery())
+        ).delete(synchronize_session=False)
+        self.db.query(ContentEmbedding).filter(
+            ContentEmbedding.source_type == SOURCE_RESUME,
+            ContentEmbedding.source_id == resume_id
+        ).delete(synchronize_session=False)
+
+    def resume_index(self, resume: Resume) -> EmbeddingIndex:
+        """简历模块索引；缺少向量或向量已过期时先重新计算"""
+        sections = resume_sections(resume.content or {})
+        rows = self._rows(SOURCE_RESUME, resume.id)
+        if {key: row.content_hash for key, row in rows.items()} != {
+            key: self.content_hash(text) for key, text in sections.items()
+        }:
+            self._sync(SOURCE_RESUME, resume.id, sections)
+            self.db.commit()
+            rows = self._rows(SOURCE_RESUME, resume.id)
+
+        return EmbeddingIndex.from_bytes([(key, row.vector) for key, row in rows.items()], self.dim)
+
+    def search_resume_sections(self, resume: Resume, query: str, top_k: int) -> List[Tuple[str, float]]:
+        """与查询文本最相关的简历模块路径及相似度"""
+        return self.resume_index(resume).search(embed_text(query, self.dim), top_k)
+
+    def similar_jds(self, resume: Resume, top_k: int) -> List[Tuple[OptimizationRecord, float]]:
+        """在用户历史优化记录的JD中检索与简历最匹配的，相同JD只保留最新一条"""
+        self._refresh_jds(resume.owner_id)
+
+        rows = self.db.query(ContentEmbedding.source_id, ContentEmbedding.content_hash, ContentEmbedding.vector).join(
+            OptimizationRecord, OptimizationRecord.id == ContentEmbedding.source_id
+        ).join(
+            Resume, Resume.id == OptimizationRecord.resume_id
+        ).filter(
+            ContentEmbedding.source_type == SOURCE_JD,
+            Resume.owner_id == resume.owner_id
+        ).order_by(ContentEmbedding.source_id.desc()).all()
+
+        seen = set()
+        items = []
+        for record_id, digest, vector in rows:
+            if digest in seen:
+                continue
+            seen.add(digest)
+            items.append((record_id, vector))
+
+        index = EmbeddingIndex.from_bytes(items, self.dim)
+        matches = index.search(embed_text(flatten_text(resume.content), self.dim), top_k)
+        if not matches:
+            return []
+
+        records = {
+            record.id: record
+            for record in self.db.query(OptimizationRecord).filter(
+                OptimizationRecord.id.in_([record_id for record_id, _ in matches])
+            )
+        }
+        return [(records[record_id], score) for record_id, score in matches if record_id in records]
+
+    def _refresh_jds(self, owner_id: int) -> None:
+        """为尚无向量或向量已过期（JD内容、向量版本或维度变化）的历史优化记录重新计算JD向量"""
+        rows = self.db.query(
+            OptimizationRecord.id, OptimizationRecord.jd_content, ContentEmbedding.content_hash
+        ).join(
+            Resume, Resume.id == OptimizationRecord.resume_id
+        ).outerjoin(
+            ContentEmbedding,
+            (ContentEmbedding.source_type == SOURCE_JD) & (ContentEmbedding.source_id == OptimizationRecord.id)
+        ).filter(
+            Resume.owner_id == owner_id
+        ).all()
+
+        stale = [
+            (record_id, jd_content) for record_id, jd_content, digest in rows
+            if digest != self.content_hash(jd_content)
+        ]
+        if stale:
+            for record_id, jd_content in stale:
+                self._sync(SOURCE_JD, record_id, {JD_SECTION: jd_content})
+            self.db.commit()
+
+    def _rows(self, source_type: str, source_id: int) -> Dict[str, ContentEmbedding]:
+        rows = self.db.query(ContentEmbedding).filter(
+            ContentEmbedding.source_type == source_type,
+            ContentEmbedding.source_id == source_id
+        ).all()
+        return {row.section: row for row in rows}
+
+    def _sync(self, source_type: str, source_id: int, sections: Dict[str, str]) -> None:
+        """使保存的向量与给定模块一致：新增或更新变化的模块，删除已不存在的模块"""
+        existing = self._rows(source_type, source_id)
+
+        for section, row in existing.items():
+            if section not in sections:
+                self.db.delete(row)
+
+        for section, text in sections.items():
+            digest = self.content_hash(text)
+            row = existing.get(section)
+            if row is not None and row.content_hash == digest:
+                continue
+
+            vector = embed_text(text, self.dim).tobytes()
+            if row is None:
+                self.db.add(ContentEmbedding(
+                    source_type=source_type,
+                    source_id=source_id,
+                    section=section,
+                    content_hash=digest,
+                    vector=vector
+                ))
+            else:
+                row.content_hash = digest
+                row.vector = vector
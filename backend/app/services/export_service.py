@@ -1,6 +1,11 @@
 import os
+import re
+import json
+import time
 import uuid
-from typing import Dict, Any
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Union, BinaryIO, Tuple
 from io import BytesIO
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
@@ -13,32 +18,21 @@ from docx import Document
 from docx.shared import Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from app.core.config import settings
+from app.services.html_template_service import html_template_registry
 
-class ExportService:
-    def __init__(self):
-        self.export_dir = os.path.join(settings.UPLOAD_DIR, "exports")
-        os.makedirs(self.export_dir, exist_ok=True)
-        
-        # 注册中文字体（如果有的话）
-        try:
-            # 这里可以添加中文字体支持
-            # pdfmetrics.registerFont(TTFont('SimSun', 'simsun.ttc'))
-            pass
-        except:
-            pass
-    
-    def export_to_pdf(self, resume_content: Dict[str, Any], template: str = "default") -> str:
-        """导出简历为PDF"""
-        
-        # 生成唯一文件名
-        filename = f"resume_{uuid.uuid4().hex}.pdf"
-        filepath = os.path.join(self.export_dir, filename)
-        
-        # 创建PDF文档
-        doc = SimpleDocTemplate(filepath, pagesize=A4)
-        story = []
-        
-        # 获取样式
+# 内容地址导出文件名：resume_<32位哈希>.<格式>
+CONTENT_ADDRESSED_NAME = re.compile(r'^resume_([0-9a-f]{32})\.(pdf|docx|html)$')
+
+# 导出文件ETag缓存（LRU）：路径 -> ((修改时间ns, 大小), ETag)
+ETAG_CACHE_SIZE = 1024
+_etag_cache: "OrderedDict[str, Tuple[Tuple[int, int], str]]" = OrderedDict()
+
+_pdf_styles = None
+
+def get_pdf_styles():
+    """构建并缓存PDF样式（标题、小节标题、正文），渲染进程启动时预热"""
+    global _pdf_styles
+    if _pdf_styles is None:
         styles = getSampleStyleSheet()
         title_style = ParagraphStyle(
             'CustomTitle',
@@ -58,7 +52,87 @@ class ExportService:
             spaceBefore=12
         )
         
-        normal_style = styles['Normal']
+        _pdf_styles = (title_style, heading_style, styles['Normal'])
+    return _pdf_styles
+
+class ExportService:
+    # 渲染逻辑变化时递增，使旧的缓存文件失效
+    RENDERER_VERSION = "2"
+    
+    # 参与渲染的简历字段，只有这些字段变化才需要重新导出
+    RENDERED_FIELDS = ("personal_info", "education", "work_experience", "skills", "projects")
+    
+    MEDIA_TYPES = {
+        "pdf": "application/pdf",
+        "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "html": "text/html"
+    }
+    
+    def __init__(self):
+        self.export_dir = os.path.join(settings.UPLOAD_DIR, "exports")
+        os.makedirs(self.export_dir, exist_ok=True)
+        
+        # 注册中文字体（如果有的话）
+        try:
+            # 这里可以添加中文字体支持
+            # pdfmetrics.registerFont(TTFont('SimSun', 'simsun.ttc'))
+            pass
+        except:
+            pass
+    
+    def content_hash(self, resume_content: Dict[str, Any], export_format: str, template: str = "default") -> str:
+        """根据简历渲染内容、导出格式、模板和渲染器版本计算内容地址"""
+        rendered = {key: resume_content.get(key) for key in self.RENDERED_FIELDS}
+        # 只有HTML使用模板，按实际渲染的模板计算；PDF/Word不区分模板，避免同样的内容重复渲染
+        resolved_template = html_template_registry.resolve(template) if export_format == "html" else None
+        key_material = json.dumps(
+            [rendered, export_format, resolved_template, self.RENDERER_VERSION],
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str
+        )
+        return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+    
+    def get_cached_path(self, resume_content: Dict[str, Any], export_format: str, template: str = "default") -> str:
+        """返回内容对应的导出文件路径（文件不一定存在）"""
+        digest = self.content_hash(resume_content, export_format, template)
+        return os.path.join(self.export_dir, f"resume_{digest[:32]}.{export_format}")
+    
+    def _cached_export(self, resume_content: Dict[str, Any], export_format: str, template: str, render: Callable[[str], None]) -> str:
+        """内容未变化时直接返回已有文件，否则渲染到临时文件后原子地移动到最终路径"""
+        filepath = self.get_cached_path(resume_content, export_format, template)
+        
+        if os.path.exists(filepath):
+            self.mark_used(filepath)
+            return filepath
+        
+        tmp_path = os.path.join(self.export_dir, f".tmp_{uuid.uuid4().hex}.{export_format}")
+        try:
+            render(tmp_path)
+            os.replace(tmp_path, filepath)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        
+        return filepath
+    
+    def export_to_pdf(self, resume_content: Dict[str, Any], template: str = "default") -> str:
+        """导出简历为PDF（相同内容复用已有文件）"""
+        return self._cached_export(
+            resume_content, "pdf", template,
+            lambda filepath: self._render_pdf(resume_content, template, filepath)
+        )
+    
+    def _render_pdf(self, resume_content: Dict[str, Any], template: str, output: Union[str, BinaryIO]) -> None:
+        """渲染PDF到指定路径或二进制缓冲区"""
+        
+        # 创建PDF文档
+        # invariant 固定创建时间和文档ID，相同内容重新渲染得到相同字节
+        doc = SimpleDocTemplate(output, pagesize=A4, invariant=1)
+        story = []
+        
+        # 获取样式（进程内只构建一次）
+        title_style, heading_style, normal_style = get_pdf_styles()
         
         # 添加个人信息
         personal_info = resume_content.get("personal_info", {})
@@ -131,15 +205,16 @@ class ExportService:
         
         # 构建PDF
         doc.build(story)
-        
-        return filepath
     
     def export_to_docx(self, resume_content: Dict[str, Any], template: str = "default") -> str:
-        """导出简历为Word文档"""
-        
-        # 生成唯一文件名
-        filename = f"resume_{uuid.uuid4().hex}.docx"
-        filepath = os.path.join(self.export_dir, filename)
+        """导出简历为Word文档（相同内容复用已有文件）"""
+        return self._cached_export(
+            resume_content, "docx", template,
+            lambda filepath: self._render_docx(resume_content, template, filepath)
+        )
+    
+    def _render_docx(self, resume_content: Dict[str, Any], template: str, output: Union[str, BinaryIO]) -> None:
+        """渲染Word文档到指定路径或二进制缓冲区"""
         
         # 创建Word文档
         doc = Document()
@@ -208,223 +283,102 @@ class ExportService:
                 doc.add_paragraph(project.get('description', ''), style='List Bullet 2')
         
         # 保存文档
-        doc.save(filepath)
-        
-        return filepath
+        doc.save(output)
+    
+    def export(self, resume_content: Dict[str, Any], export_format: str, template: str = "default") -> str:
+        """按格式导出简历"""
+        if export_format == "pdf":
+            return self.export_to_pdf(resume_content, template)
+        elif export_format == "docx":
+            return self.export_to_docx(resume_content, template)
+        elif export_format == "html":
+            return self.export_to_html(resume_content, template)
+        raise ValueError(f"Unsupported export format: {export_format}")
+    
+    def render_to_bytes(self, resume_content: Dict[str, Any], export_format: str, template: str = "default") -> bytes:
+        """直接在内存中渲染导出内容，不写入导出目录"""
+        renderers = {
+            "pdf": self._render_pdf,
+            "docx": self._render_docx,
+            "html": self._render_html
+        }
+        if export_format not in renderers:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        
+        buffer = BytesIO()
+        renderers[export_format](resume_content, template, buffer)
+        return buffer.getvalue()
     
     def export_to_html(self, resume_content: Dict[str, Any], template: str = "default") -> str:
-        """导出简历为HTML"""
+        """导出简历为HTML（相同内容复用已有文件）"""
+        return self._cached_export(
+            resume_content, "html", template,
+            lambda filepath: self._render_html(resume_content, template, filepath)
+        )
+    
+    def _render_html(self, resume_content: Dict[str, Any], template: str, output: Union[str, BinaryIO]) -> None:
+        """渲染HTML到指定路径或二进制缓冲区"""
         
-        # 生成唯一文件名
-        filename = f"resume_{uuid.uuid4().hex}.html"
-        filepath = os.path.join(self.export_dir, filename)
+        # 流式渲染模板，逐段写出
+        chunks = html_template_registry.stream(resume_content, template)
         
-        # 构建HTML内容
-        html_content = self._build_html_content(resume_content, template)
+        if not isinstance(output, str):
+            for chunk in chunks:
+                output.write(chunk.encode('utf-8'))
+            return
         
         # 保存HTML文件
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        return filepath
+        with open(output, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(chunk)
     
     def _build_html_content(self, resume_content: Dict[str, Any], template: str) -> str:
-        """构建HTML内容"""
-        
-        personal_info = resume_content.get("personal_info", {})
-        education = resume_content.get("education", [])
-        work_experience = resume_content.get("work_experience", [])
-        skills = resume_content.get("skills", [])
-        projects = resume_content.get("projects", [])
-        
-        html = f"""
-        <!DOCTYPE html>
-        <html lang="zh-CN">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>简历 - {personal_info.get('name', '')}</title>
-            <style>
-                body {{
-                    font-family: 'Microsoft YaHei', Arial, sans-serif;
-                    line-height: 1.6;
-                    margin: 0;
-                    padding: 20px;
-                    background-color: #f5f5f5;
-                }}
-                .container {{
-                    max-width: 800px;
-                    margin: 0 auto;
-                    background-color: white;
-                    padding: 40px;
-                    border-radius: 10px;
-                    box-shadow: 0 0 10px rgba(0,0,0,0.1);
-                }}
-                .header {{
-                    text-align: center;
-                    margin-bottom: 30px;
-                    border-bottom: 2px solid #007bff;
-                    padding-bottom: 20px;
-                }}
-                .name {{
-                    font-size: 2.5em;
-                    font-weight: bold;
-                    color: #333;
-                    margin-bottom: 10px;
-                }}
-                .contact {{
-                    font-size: 1.1em;
-                    color: #666;
-                }}
-                .section {{
-                    margin-bottom: 30px;
-                }}
-                .section-title {{
-                    font-size: 1.5em;
-                    font-weight: bold;
-                    color: #007bff;
-                    border-bottom: 1px solid #eee;
-                    padding-bottom: 5px;
-                    margin-bottom: 15px;
-                }}
-                .item {{
-                    margin-bottom: 15px;
-                }}
-                .item-title {{
-                    font-weight: bold;
-                    color: #333;
-                }}
-                .item-subtitle {{
-                    color: #666;
-                    font-style: italic;
-                }}
-                .item-content {{
-                    margin-top: 5px;
-                    color: #555;
-                }}
-                .skills {{
-                    display: flex;
-                    flex-wrap: wrap;
-                    gap: 10px;
-                }}
-                .skill {{
-                    background-color: #e9ecef;
-                    padding: 5px 10px;
-                    border-radius: 15px;
-                    font-size: 0.9em;
-                }}
-                ul {{
-                    padding-left: 20px;
-                }}
-                li {{
-                    margin-bottom: 5px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <div class="name">{personal_info.get('name', '')}</div>
-                    <div class="contact">
-        """
-        
-        # 添加联系信息
-        contact_info = []
-        if personal_info.get("email"):
-            contact_info.append(f"邮箱: {personal_info['email']}")
-        if personal_info.get("phone"):
-            contact_info.append(f"电话: {personal_info['phone']}")
-        if personal_info.get("address"):
-            contact_info.append(f"地址: {personal_info['address']}")
-        
-        html += " | ".join(contact_info)
-        html += """
-                    </div>
-                </div>
-        """
-        
-        # 添加教育背景
-        if education:
-            html += """
-                <div class="section">
-                    <div class="section-title">教育背景</div>
-            """
-            for edu in education:
-                html += f"""
-                    <div class="item">
-                        <div class="item-title">{edu.get('school', '')}</div>
-                        <div class="item-subtitle">{edu.get('degree', '')} - {edu.get('major', '')} ({edu.get('duration', '')})</div>
-                    </div>
-                """
-            html += "</div>"
-        
-        # 添加工作经验
-        if work_experience:
-            html += """
-                <div class="section">
-                    <div class="section-title">工作经验</div>
-            """
-            for work in work_experience:
-                html += f"""
-                    <div class="item">
-                        <div class="item-title">{work.get('company', '')}</div>
-                        <div class="item-subtitle">{work.get('position', '')} ({work.get('duration', '')})</div>
-                        <div class="item-content">
-                            <ul>
-                """
-                for resp in work.get("responsibilities", []):
-                    html += f"<li>{resp}</li>"
-                html += """
-                            </ul>
-                        </div>
-                    </div>
-                """
-            html += "</div>"
-        
-        # 添加技能
-        if skills:
-            html += """
-                <div class="section">
-                    <div class="section-title">技能</div>
-                    <div class="skills">
-            """
-            for skill in skills:
-                html += f'<span class="skill">{skill}</span>'
-            html += """
-                    </div>
-                </div>
-            """
-        
-        # 添加项目经验
-        if projects:
-            html += """
-                <div class="section">
-                    <div class="section-title">项目经验</div>
-            """
-            for project in projects:
-                html += f"""
-                    <div class="item">
-                        <div class="item-title">{project.get('name', '')}</div>
-                        <div class="item-content">{project.get('description', '')}</div>
-                    </div>
-                """
-            html += "</div>"
+        """构建HTML内容（使用预编译模板）"""
+        return html_template_registry.render(resume_content, template)
+    
+    def mark_used(self, filepath: str) -> None:
+        """更新文件访问时间作为最近使用时间，供存储清理按LRU淘汰（修改时间保持为生成时间）"""
+        try:
+            stat = os.stat(filepath)
+            os.utime(filepath, (time.time(), stat.st_mtime))
+        except OSError:
+            pass
+    
+    def is_content_addressed(self, filename: str) -> bool:
+        """文件名是否为内容地址（同名文件内容不会变化）"""
+        return bool(CONTENT_ADDRESSED_NAME.match(filename))
+    
+    def get_file_etag(self, filepath: str) -> str:
+        """按文件字节计算强ETag
         
-        html += """
-            </div>
-        </body>
-        </html>
+        内容地址文件被清理后重新渲染时字节可能不同（DOCX压缩包内的时间戳等），
+        不能直接使用文件名中的输入哈希；结果按 (修改时间, 大小) 缓存，文件未变化时不重复计算
         """
-        
-        return html
+        stat = os.stat(filepath)
+        cached = _etag_cache.get(filepath)
+        if cached and cached[0] == (stat.st_mtime_ns, stat.st_size):
+            _etag_cache.move_to_end(filepath)
+            return cached[1]
+        
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b''):
+                digest.update(chunk)
+        etag = f'"{digest.hexdigest()[:32]}"'
+        _etag_cache[filepath] = ((stat.st_mtime_ns, stat.st_size), etag)
+        _etag_cache.move_to_end(filepath)
+        if len(_etag_cache) > ETAG_CACHE_SIZE:
+            _etag_cache.popitem(last=False)
+        return etag
     
     def get_file_url(self, filepath: str) -> str:
         """获取文件的访问URL"""
         filename = os.path.basename(filepath)
-        return f"/api/v1/export/download/{filename}"
+        return f"{settings.API_V1_STR}/resumes/download/{filename}"
     
     def delete_file(self, filepath: str) -> bool:
         """删除导出的文件"""
+        _etag_cache.pop(filepath, None)
         try:
             if os.path.exists(filepath):
                 os.remove(filepath)
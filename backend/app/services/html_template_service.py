@@ -0,0 +1,84 @@
+"""
+HTML简历模板注册表
+模板在模块加载时编译一次，之后每次渲染只需填充数据，支持流式输出
+"""
+
+import os
+from typing import Dict, Any, Iterator, List
+from jinja2 import Environment, FileSystemLoader, Template
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "export")
+
+
+class HTMLTemplateRegistry:
+    """导出/预览用HTML模板注册表"""
+
+    # 模板名称 -> 模板文件，对应导出请求中的 template 参数
+    TEMPLATES = {
+        "default": "default.html.j2",
+        "compact": "compact.html.j2"
+    }
+
+    DEFAULT_TEMPLATE = "default"
+
+    def __init__(self):
+        self.env = Environment(
+            loader=FileSystemLoader(TEMPLATE_DIR),
+            autoescape=True,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            auto_reload=False
+        )
+        self._compiled: Dict[str, Template] = {
+            name: self.env.get_template(filename)
+            for name, filename in self.TEMPLATES.items()
+        }
+
+    def available_templates(self) -> List[str]:
+        return list(self._compiled.keys())
+
+    def resolve(self, template: str) -> str:
+        """实际使用的模板名称，未知模板名回退为默认模板"""
+        return template if template in self._compiled else self.DEFAULT_TEMPLATE
+
+    def get(self, template: str) -> Template:
+        """获取已编译模板，未知模板名回退为默认模板"""
+        return self._compiled[self.resolve(template)]
+
+    def render(self, resume_content: Dict[str, Any], template: str = "default") -> str:
+        """渲染完整HTML"""
+        return self.get(template).render(**self._build_context(resume_content))
+
+    def stream(self, resume_content: Dict[str, Any], template: str = "default") -> Iterator[str]:
+        """逐段生成HTML，适合大简历边渲染边写出"""
+        return self.get(template).generate(**self._build_context(resume_content))
+
+    def _build_context(self, resume_content: Dict[str, Any]) -> Dict[str, Any]:
+        """将简历内容整理为模板变量"""
+        personal_info = resume_content.get("personal_info") or {}
+
+        contact_info = []
+        if personal_info.get("email"):
+            contact_info.append(f"邮箱: {personal_info['email']}")
+        if personal_info.get("phone"):
+            contact_info.append(f"电话: {personal_info['phone']}")
+        if personal_info.get("address"):
+            contact_info.append(f"地址: {personal_info['address']}")
+
+        # 技能兼容字符串和 {"name": ...} 两种格式
+        skills = [
+            skill.get("name", "") if isinstance(skill, dict) else str(skill)
+            for skill in resume_content.get("skills") or []
+        ]
+
+        return {
+            "personal_info": personal_info,
+            "contact_info": contact_info,
+            "education": resume_content.get("education") or [],
+            "work_experience": resume_content.get("work_experience") or [],
+            "skills": [skill for skill in skills if skill],
+            "projects": resume_content.get("projects") or []
+        }
+
+
+html_template_registry = HTMLTemplateRegistry()
@@ -0,0 +1,114 @@
+"""
+面试问题预生成服务
+在候选人提交答案后立即于后台生成下一个追问问题，获取问题时直接返回
+"""
+
+import asyncio
+from typing import Dict, Any, List, Optional
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.models.resume import InterviewSession, Resume
+from app.services.openrouter_service import OpenRouterService
+
+
+def build_conversation_history(interview_session: InterviewSession) -> List[Dict[str, str]]:
+    """根据会话的问题和答案构建对话历史"""
+    questions = interview_session.questions or []
+    conversation_history = []
+
+    for i, answer in enumerate(interview_session.answers or []):
+        if i < len(questions) and isinstance(answer, dict) and answer.get("answer"):
+            conversation_history.append({
+                "question": questions[i]["question"],
+                "answer": answer["answer"]
+            })
+
+    return conversation_history
+
+
+class InterviewPrefetchService:
+    """面试追问问题预生成服务（进程内任务表，按会话ID跟踪进行中的预生成任务）"""
+
+    _tasks: Dict[int, asyncio.Task] = {}
+
+    def schedule(self, session_id: int) -> None:
+        """为会话安排后台预生成任务（同一会话同时只保留一个任务）"""
+        task = self._tasks.get(session_id)
+        if task and not task.done():
+            return
+
+        task = asyncio.create_task(self._prefetch(session_id))
+        self._tasks[session_id] = task
+        task.add_done_callback(lambda t: self._discard_task(session_id, t))
+
+    def _discard_task(self, session_id: int, task: asyncio.Task) -> None:
+        """任务结束后从任务表移除"""
+        if self._tasks.get(session_id) is task:
+            del self._tasks[session_id]
+
+    async def take(self, db: Session, interview_session: InterviewSession, question_index: int) -> Optional[Dict[str, Any]]:
+        """取出与指定问题索引匹配的预生成问题，没有可用结果时返回None"""
+        # 有进行中的预生成任务时等待其完成，避免同时再发起一次即时生成（重复的LLM调用）；
+        # shield 保证请求被取消时预生成任务仍继续，结果可供下次获取
+        task = self._tasks.get(interview_session.id)
+        if task and not task.done():
+            try:
+                await asyncio.shield(task)
+            except Exception:
+                return None
+
+        # 预生成任务使用独立的数据库会话写入，这里需要重新加载
+        db.refresh(interview_session)
+
+        prefetched = interview_session.prefetched_question
+        if not isinstance(prefetched, dict) or prefetched.get("question_index") != question_index:
+            return None
+
+        return {
+            "question": prefetched["question"],
+            "type": prefetched.get("type", "follow_up")
+        }
+
+    async def _prefetch(self, session_id: int) -> None:
+        """后台生成下一个问题并保存到会话"""
+        db = SessionLocal()
+        try:
+            interview_session = db.query(InterviewSession).filter(InterviewSession.id == session_id).first()
+            if not interview_session or interview_session.status != "active":
+                return
+
+            question_index = len(interview_session.answers or [])
+            if question_index < len(interview_session.questions or []):
+                # 仍有预设问题，无需预生成
+                return
+
+            resume = db.query(Resume).filter(Resume.id == interview_session.resume_id).first()
+            if not resume:
+                return
+
+            openrouter_service = OpenRouterService()
+            new_question = await openrouter_service.generate_next_interview_question(
+                build_conversation_history(interview_session),
+                resume.content
+            )
+
+            # 生成期间若会话已变化（新的答案或问题），丢弃本次结果
+            db.refresh(interview_session)
+            if len(interview_session.answers or []) != question_index or len(interview_session.questions or []) != question_index:
+                return
+
+            interview_session.prefetched_question = {
+                "question": new_question["question"],
+                "type": new_question.get("type", "follow_up"),
+                "question_index": question_index
+            }
+            db.commit()
+
+        except Exception as e:
+            db.rollback()
+            print(f"预生成面试问题失败 (会话 {session_id}): {e}")
+        finally:
+            db.close()
+
+
+interview_prefetch_service = InterviewPrefetchService()
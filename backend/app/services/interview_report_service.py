@@ -3,11 +3,14 @@
 基于面试对话数据生成详细的分析报告
 """
 
-from typing import Dict, Any, List, Optional
-import json
+from typing import Dict, Any, List, Optional, Type
 import re
 from datetime import datetime
+from pydantic import BaseModel
+from app.core.structured_output import StructuredOutputError, json_schema_response_format, parse_json_loose, parse_structured
+from app.schemas.interview import CompetencyScores, InterviewFeedback, QAEvaluation
 from app.services.openrouter_service import OpenRouterService
+from app.services.interview_scoring_service import InterviewScoringService
 from app.models.resume import InterviewSession
 
 
@@ -17,23 +20,19 @@ class InterviewReportService:
     def __init__(self):
         self.openrouter_service = OpenRouterService()
     
-    def _safe_json_parse(self, content: str, default_value: Dict[str, Any] = None) -> Dict[str, Any]:
-        """安全的JSON解析函数"""
+    def _safe_json_parse(self, content: str, default_value: Dict[str, Any] = None, model: Optional[Type[BaseModel]] = None) -> Dict[str, Any]:
+        """安全的JSON解析函数：格式问题先在本地修复，提供 model 时按模型校验，失败时返回默认值"""
         try:
-            # 清理可能的非JSON内容
-            content = content.strip()
-            if content.startswith('```json'):
-                content = content.replace('```json', '').replace('```', '').strip()
-            elif content.startswith('```'):
-                content = content.replace('```', '').strip()
+            if model is not None:
+                return parse_structured(content, model).model_dump()
             
-            return json.loads(content)
-        except json.JSONDecodeError as e:
+            data = parse_json_loose(content)
+            if not isinstance(data, dict):
+                raise StructuredOutputError("JSON root is not an object")
+            return data
+        except StructuredOutputError as e:
             print(f"JSON解析失败: {e}, 内容前200字符: {content[:200]}...")
             return default_value or {}
-        except Exception as e:
-            print(f"解析时发生其他错误: {e}")
-            return default_value or {}
     
     async def generate_comprehensive_report(self, interview_session: InterviewSession) -> Dict[str, Any]:
         """生成完整的面试报告"""
@@ -144,6 +143,13 @@ class InterviewReportService:
                 "behavioral": 0
             }
         
+        # 面试过程中已逐题累积能力信号时，直接本地汇总，无需调用AI
+        aggregated = InterviewScoringService().aggregate_session_scores(
+            getattr(interview_session, 'score_summary', None)
+        )
+        if aggregated:
+            return aggregated["competency_scores"]
+        
         # 构建对话文本
         conversation_text = "\n".join([
             f"问题：{item['question']}\n回答：{item['answer']}"
@@ -179,7 +185,10 @@ class InterviewReportService:
                 {"role": "user", "content": prompt}
             ]
             
-            response = await self.openrouter_service.chat_completion(messages)
+            response = await self.openrouter_service.chat_completion(
+                messages,
+                response_format=json_schema_response_format(CompetencyScores, "competency_scores")
+            )
             content = response["choices"][0]["message"]["content"].strip()
             
             # 尝试解析JSON
@@ -189,7 +198,7 @@ class InterviewReportService:
                 "project_exposition": 75,
                 "communication": 75,
                 "behavioral": 75
-            })
+            }, CompetencyScores)
             
             # 验证和规范化分数
             normalized_scores = {}
@@ -250,13 +259,16 @@ class InterviewReportService:
                 {"role": "user", "content": prompt}
             ]
             
-            response = await self.openrouter_service.chat_completion(messages)
+            response = await self.openrouter_service.chat_completion(
+                messages,
+                response_format=json_schema_response_format(InterviewFeedback, "interview_feedback")
+            )
             content = response["choices"][0]["message"]["content"].strip()
             
             feedback = self._safe_json_parse(content, {
                 "highlights": [],
                 "improvements": []
-            })
+            }, InterviewFeedback)
             return {
                 "highlights": feedback.get("highlights", []),
                 "improvements": feedback.get("improvements", [])
@@ -341,13 +353,16 @@ class InterviewReportService:
             {"role": "user", "content": prompt}
         ]
         
-        response = await self.openrouter_service.chat_completion(messages)
+        response = await self.openrouter_service.chat_completion(
+            messages,
+            response_format=json_schema_response_format(QAEvaluation, "qa_evaluation")
+        )
         content = response["choices"][0]["message"]["content"].strip()
         
         return self._safe_json_parse(content, {
-            "score": 75,
+            "score": 7,
             "analysis": "分析暂时不可用"
-        })
+        }, QAEvaluation)
     
     async def _analyze_keywords_coverage(self, conversation: List[Dict[str, str]], jd_content: str) -> Dict[str, Any]:
         """分析关键词覆盖率"""
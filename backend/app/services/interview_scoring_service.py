@@ -19,6 +19,9 @@ class ScoringResult:
     overall_score: float  # 综合评分 (0-100)
     suggestions: List[str]  # 改进建议
 
+# 面试报告雷达图的五个能力维度
+COMPETENCY_KEYS = ["job_fit", "technical_depth", "project_exposition", "communication", "behavioral"]
+
 class InterviewScoringService:
     """面试回答评分服务"""
     
@@ -88,6 +91,95 @@ class InterviewScoringService:
             suggestions=suggestions
         )
     
+    def score_answer_signals(self, question: str, answer: str, jd_keywords: List[str] = None, llm_score: Optional[int] = None) -> Dict[str, Any]:
+        """
+        本地计算单个回答的分数和能力信号（不调用AI），用于逐题累积
+        
+        Args:
+            question: 面试问题
+            answer: 候选人回答
+            jd_keywords: 职位描述关键词
+            llm_score: 结构化评估给出的0-100分数（如有），只作为单独的参考信号保存
+        
+        Returns:
+            {"score": 本题本地分数, "competencies": 各能力维度分数, "llm_score": AI评分或None}
+            所有题目的 score 都由同一套本地规则计算，整体分数不受各题是否有AI评分影响
+        
+        """
+        relevance_score = self._score_relevance(question, answer)
+        star_analysis = self._analyze_star_method(answer)
+        keyword_match = self._analyze_keywords(answer, jd_keywords)
+        fluency_score = self._score_fluency(answer)
+        local_score = self._calculate_overall_score(
+            relevance_score, star_analysis, keyword_match, fluency_score
+        )
+        
+        star_score = sum(star_analysis.values()) / 4 * 100
+        tech_matches = len(keyword_match["matched_tech_keywords"])
+        technical_depth = min(100, 40 + tech_matches * 15) if tech_matches else relevance_score * 0.6
+        job_fit = keyword_match["jd_coverage"] * 0.6 + relevance_score * 0.4 if jd_keywords else relevance_score
+        project_exposition = star_score * 0.6 + min(len(answer) / 300, 1.0) * 40
+        behavioral = star_score * 0.7 + fluency_score * 0.3
+        communication = fluency_score * 0.6 + relevance_score * 0.4
+        
+        competencies = {
+            "job_fit": job_fit,
+            "technical_depth": technical_depth,
+            "project_exposition": project_exposition,
+            "communication": communication,
+            "behavioral": behavioral
+        }
+        
+        return {
+            "score": max(0, min(100, round(local_score))),
+            "competencies": {key: max(0, min(100, round(value))) for key, value in competencies.items()},
+            "llm_score": max(0, min(100, round(llm_score))) if llm_score is not None else None
+        }
+    
+    def accumulate_answer_signals(self, score_summary: Optional[Dict[str, Any]], question_index: int, signals: Dict[str, Any]) -> Dict[str, Any]:
+        """将单题信号合并进会话的分数汇总（按题目索引覆盖，重复作答不会重复计分）"""
+        answers = dict((score_summary or {}).get("answers", {}))
+        answers[str(question_index)] = signals
+        return {"answers": answers}
+    
+    def aggregate_session_scores(self, score_summary: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """由逐题累积的信号本地汇总整体分数和能力雷达，没有累积数据时返回None"""
+        answers = list((score_summary or {}).get("answers", {}).values())
+        if not answers:
+            return None
+        
+        overall_score = round(sum(item.get("score", 0) for item in answers) / len(answers))
+        competency_scores = {}
+        for key in COMPETENCY_KEYS:
+            values = [item.get("competencies", {}).get(key, 0) for item in answers]
+            competency_scores[key] = round(sum(values) / len(values))
+        
+        # AI评分只覆盖部分题目，单独汇总，不参与整体分数
+        llm_scores = [item["llm_score"] for item in answers if item.get("llm_score") is not None]
+        
+        return {
+            "overall_score": overall_score,
+            "competency_scores": competency_scores,
+            "answer_count": len(answers),
+            "llm_average_score": round(sum(llm_scores) / len(llm_scores)) if llm_scores else None,
+            "llm_scored_count": len(llm_scores)
+        }
+    
+    async def calculate_session_overall_score(self, interview_session: Any) -> int:
+        """计算会话整体分数：优先本地汇总逐题信号，没有累积数据的旧会话回退为AI评分"""
+        aggregated = self.aggregate_session_scores(interview_session.score_summary)
+        if aggregated:
+            return aggregated["overall_score"]
+        
+        # 将面试会话转换为字典格式以便传递给分数计算函数
+        session_dict = {
+            "questions": interview_session.questions,
+            "answers": interview_session.answers,
+            "feedback": interview_session.feedback
+        }
+        
+        return await self.openrouter_service.calculate_overall_score(session_dict)
+    
     def _score_relevance(self, question: str, answer: str) -> float:
         """评估回答与问题的相关性"""
         if not answer or len(answer.strip()) < 10:
@@ -0,0 +1,194 @@
+"""
+面试统计服务
+统计数据由一次分组聚合查询得出；启用汇总表时按用户保存结果，并在会话创建、结束、评分时增量更新，
+仪表盘每次加载只需读取一行
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import case, func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.resume import InterviewSession, Resume, UserInterviewStats
+
+# (status, overall_score)，会话不存在时为 None
+SessionState = Optional[Tuple[str, Optional[int]]]
+
+
+class InterviewStatsService:
+    """按用户聚合的面试统计"""
+
+    RECENT_SCORE_LIMIT = 10  # 分数趋势使用的最近分数个数
+    TREND_THRESHOLD = 1.0    # 前后半段平均分差异小于该值视为持平
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_stats(self, user_id: int) -> Dict[str, Any]:
+        """获取用户面试统计"""
+        if not settings.INTERVIEW_STATS_MATERIALIZED:
+            return self._format(*self._aggregate(user_id))
+
+        stats = self.db.query(UserInterviewStats).filter(UserInterviewStats.user_id == user_id).first()
+        if stats is None:
+            stats = self.rebuild(user_id)
+
+        return self._format(
+            {
+                "total_count": stats.total_count,
+                "completed_count": stats.completed_count,
+                "active_count": stats.active_count,
+                "scored_count": stats.scored_count,
+                "score_sum": stats.score_sum
+            },
+            list(stats.recent_scores or [])
+        )
+
+    def rebuild(self, user_id: int) -> UserInterviewStats:
+        """重新聚合并写入汇总表"""
+        counts, recent_scores = self._aggregate(user_id)
+        values = {**counts, "recent_scores": recent_scores}
+
+        stats = self.db.query(UserInterviewStats).filter(UserInterviewStats.user_id == user_id).first()
+        if stats is None:
+            try:
+                with self.db.begin_nested():
+                    stats = UserInterviewStats(user_id=user_id, **values)
+                    self.db.add(stats)
+            except IntegrityError:
+                # 并发的首次读取已插入汇总行，改为覆盖该行
+                stats = self.db.query(UserInterviewStats).filter(UserInterviewStats.user_id == user_id).one()
+                for key, value in values.items():
+                    setattr(stats, key, value)
+        else:
+            for key, value in values.items():
+                setattr(stats, key, value)
+        self.db.commit()
+        return stats
+
+    def apply_session_change(self, user_id: int, before: SessionState, after: SessionState) -> None:
+        """按会话变化前后的 (status, overall_score) 增量更新汇总，调用方负责提交事务
+
+        before 为 None 表示新建会话，after 为 None 表示删除会话。
+        汇总行尚不存在时不做处理，首次读取时会完整聚合。
+        计数在数据库中原子增减（UPDATE ... SET count = count + 1），并发请求不会丢失更新。
+        """
+        if not settings.INTERVIEW_STATS_MATERIALIZED:
+            return
+
+        before_score = before[1] if before else None
+        after_score = after[1] if after else None
+
+        # 已有分数被修改或删除时无法增量维护分数趋势，删除汇总行，下次读取时重建
+        if before_score is not None and before_score != after_score:
+            self.invalidate(user_id)
+            return
+
+        deltas = {"total_count": 0, "completed_count": 0, "active_count": 0}
+        for state, sign in ((before, -1), (after, 1)):
+            if state is None:
+                continue
+            status, _ = state
+            deltas["total_count"] += sign
+            if status == "completed":
+                deltas["completed_count"] += sign
+            elif status == "active":
+                deltas["active_count"] += sign
+
+        values = {
+            column: getattr(UserInterviewStats, column) + delta
+            for column, delta in deltas.items() if delta
+        }
+        statement = update(UserInterviewStats).where(UserInterviewStats.user_id == user_id)
+
+        if before_score is None and after_score is not None:
+            stats = self.db.query(
+                UserInterviewStats.scored_count,
+                UserInterviewStats.recent_scores
+            ).filter(UserInterviewStats.user_id == user_id).first()
+            if stats is None:
+                return
+
+            # 分数趋势列表无法在SQL中原子追加：以 scored_count 作为版本条件更新，并发冲突时删除汇总行待重建
+            values.update(
+                scored_count=UserInterviewStats.scored_count + 1,
+                score_sum=UserInterviewStats.score_sum + after_score,
+                recent_scores=(list(stats.recent_scores or []) + [after_score])[-self.RECENT_SCORE_LIMIT:]
+            )
+            result = self.db.execute(
+                statement.where(UserInterviewStats.scored_count == stats.scored_count)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                self.invalidate(user_id)
+            return
+
+        if values:
+            self.db.execute(statement.values(**values).execution_options(synchronize_session=False))
+
+    def invalidate(self, user_id: int) -> None:
+        """删除汇总行（批量删除等难以增量维护的操作后调用），调用方负责提交事务"""
+        self.db.query(UserInterviewStats).filter(UserInterviewStats.user_id == user_id).delete()
+
+    def _aggregate(self, user_id: int) -> Tuple[Dict[str, int], List[int]]:
+        """一次分组查询统计会话数和分数，另取最近的分数用于趋势"""
+        row = self.db.query(
+            func.count(InterviewSession.id),
+            func.coalesce(func.sum(case((InterviewSession.status == "completed", 1), else_=0)), 0),
+            func.coalesce(func.sum(case((InterviewSession.status == "active", 1), else_=0)), 0),
+            func.count(InterviewSession.overall_score),
+            func.coalesce(func.sum(InterviewSession.overall_score), 0)
+        ).join(Resume, InterviewSession.resume_id == Resume.id).filter(
+            Resume.owner_id == user_id
+        ).one()
+
+        recent_rows = self.db.query(InterviewSession.overall_score).join(
+            Resume, InterviewSession.resume_id == Resume.id
+        ).filter(
+            Resume.owner_id == user_id,
+            InterviewSession.overall_score.isnot(None)
+        ).order_by(InterviewSession.id.desc()).limit(self.RECENT_SCORE_LIMIT).all()
+
+        counts = {
+            "total_count": int(row[0]),
+            "completed_count": int(row[1]),
+            "active_count": int(row[2]),
+            "scored_count": int(row[3]),
+            "score_sum": int(row[4])
+        }
+        return counts, [score for (score,) in reversed(recent_rows)]
+
+    def _format(self, counts: Dict[str, int], recent_scores: List[int]) -> Dict[str, Any]:
+        """生成接口返回格式"""
+        total = counts["total_count"]
+        completed = counts["completed_count"]
+        scored = counts["scored_count"]
+
+        return {
+            "total_interviews": total,
+            "completed_interviews": completed,
+            "active_interviews": counts["active_count"],
+            "completion_rate": round(completed / max(total, 1) * 100, 1),
+            "scored_interviews": scored,
+            "average_score": round(counts["score_sum"] / scored, 1) if scored else None,
+            "score_trend": self._score_trend(recent_scores)
+        }
+
+    def _score_trend(self, recent_scores: List[int]) -> Dict[str, Any]:
+        """比较最近分数前后两半的平均分"""
+        trend = {"recent_scores": recent_scores, "direction": "flat", "change": 0.0}
+        if len(recent_scores) < 2:
+            return trend
+
+        half = len(recent_scores) // 2
+        older = recent_scores[:half]
+        newer = recent_scores[half:]
+        change = round(sum(newer) / len(newer) - sum(older) / len(older), 1)
+
+        trend["change"] = change
+        if change >= self.TREND_THRESHOLD:
+            trend["direction"] = "up"
+        elif change <= -self.TREND_THRESHOLD:
+            trend["direction"] = "down"
+        return trend
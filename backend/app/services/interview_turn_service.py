@@ -0,0 +1,68 @@
+"""
+面试单轮处理服务
+一次结构化LLM调用同时完成回答评估和下一个问题生成，避免重复发送简历和对话上下文
+"""
+
+from typing import Dict, Any, List, Optional
+from app.core.prompts import ResumeAssistantPrompts
+from app.core.structured_output import StructuredOutputError, json_schema_response_format, parse_structured
+from app.schemas.interview import InterviewTurnResult
+from app.services.openrouter_service import OpenRouterService
+
+
+class InterviewTurnService:
+    """面试轮次引擎：回答评估 + 追问生成合并为一次调用"""
+
+    def __init__(self):
+        self.openrouter_service = OpenRouterService()
+
+    async def process_turn(
+        self,
+        question: str,
+        answer: str,
+        conversation_history: List[Dict[str, str]],
+        resume_content: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """评估当前回答并生成下一个问题
+
+        Returns:
+            {"evaluation": {...}, "next_question": {"question", "type"} 或 None}
+            结构化结果校验失败时，evaluation 退化为原始回应文本，next_question 为 None。
+        """
+        messages = ResumeAssistantPrompts.build_interview_turn_messages(
+            question, answer, conversation_history, resume_content
+        )
+
+        response = await self.openrouter_service.chat_completion(
+            messages,
+            response_format=json_schema_response_format(InterviewTurnResult, "interview_turn")
+        )
+        content = response["choices"][0]["message"]["content"]
+
+        result = self._parse_turn_result(content)
+        if result is None:
+            return {
+                "evaluation": self.openrouter_service._parse_evaluation_response(response),
+                "next_question": None
+            }
+
+        return {
+            "evaluation": {
+                "content": result.evaluation.feedback,
+                "score": result.evaluation.score,
+                "feedback": result.evaluation.feedback,
+                "suggestions": result.evaluation.suggestions
+            },
+            "next_question": {
+                "question": result.next_question.question.strip(),
+                "type": result.next_question.type or "follow_up"
+            }
+        }
+
+    def _parse_turn_result(self, content: str) -> Optional[InterviewTurnResult]:
+        """按结果模型校验AI返回的JSON（格式问题先在本地修复）"""
+        try:
+            return parse_structured(content, InterviewTurnResult)
+        except StructuredOutputError as e:
+            print(f"面试轮次结果校验失败: {e}")
+            return None
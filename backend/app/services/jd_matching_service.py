@@ -0,0 +1,79 @@
+"""
+批量JD匹配服务
+先用本地文本相似度对全部JD快速排序，只对前K个候选调用LLM做完整分析（并发受限），
+每完成一个就输出结果，最后输出综合排名
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, List
+from app.core.config import settings
+from app.services.openrouter_service import OpenRouterService
+from app.services.text_similarity import flatten_text, tfidf_similarities
+
+
+class BulkJDMatchingService:
+    """一份简历对多个JD的匹配排序"""
+
+    def __init__(self):
+        self.openrouter_service = OpenRouterService()
+
+    def prefilter(self, resume_content: Dict[str, Any], jds: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """本地相似度排序，返回按相似度降序的候选列表"""
+        similarities = tfidf_similarities(
+            flatten_text(resume_content),
+            [jd["content"] for jd in jds]
+        )
+
+        candidates = [
+            {
+                "index": index,
+                "id": jd.get("id"),
+                "title": jd.get("title"),
+                "prefilter_score": round(similarity * 100, 1)
+            }
+            for index, (jd, similarity) in enumerate(zip(jds, similarities))
+        ]
+        candidates.sort(key=lambda candidate: candidate["prefilter_score"], reverse=True)
+        return candidates
+
+    async def stream_matches(self, resume_content: Dict[str, Any], jds: List[Dict[str, Any]], top_k: int) -> AsyncIterator[Dict[str, Any]]:
+        """依次产出事件：prefilter（本地排序）、result/error（每个LLM分析完成时）、done（最终排名）"""
+        candidates = self.prefilter(resume_content, jds)
+        shortlisted = candidates[:top_k]
+
+        yield {"type": "prefilter", "candidates": candidates, "shortlisted": [c["index"] for c in shortlisted]}
+
+        semaphore = asyncio.Semaphore(settings.JD_MATCH_CONCURRENCY)
+
+        async def analyze(candidate: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                async with semaphore:
+                    analysis = await self.openrouter_service.analyze_resume_jd_match(
+                        resume_content,
+                        jds[candidate["index"]]["content"]
+                    )
+            except Exception as e:
+                return {"type": "error", **candidate, "error": str(e)}
+            return {"type": "result", **candidate, "analysis": analysis, "match_score": analysis.get("score") or 0}
+
+        tasks = {asyncio.create_task(analyze(candidate)): candidate for candidate in shortlisted}
+        results = []
+        try:
+            for next_done in asyncio.as_completed(list(tasks)):
+                event = await next_done
+                if event["type"] == "result":
+                    results.append(event)
+                yield event
+        finally:
+            # 客户端断开时取消未完成的分析
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        # LLM评分优先，相同时按本地相似度
+        results.sort(key=lambda result: (result["match_score"], result["prefilter_score"]), reverse=True)
+        ranking = [
+            {key: result[key] for key in ("index", "id", "title", "prefilter_score", "match_score")}
+            for result in results
+        ]
+        yield {"type": "done", "ranking": ranking}
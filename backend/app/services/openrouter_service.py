@@ -1,7 +1,61 @@
+import re
+import asyncio
 import httpx
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from app.core.config import settings
 from app.core.prompts import ResumeAssistantPrompts
+from app.core.structured_output import StructuredOutputError, json_schema_response_format, parse_structured
+from app.schemas.interview import InterviewQuestionList
+from app.schemas.resume import ResumeMatchAnalysis, ResumeSectionsMatchAnalysis
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算文本token数：中文字符按1个token计，其余按4个字符1个token计"""
+    if not text:
+        return 0
+    cjk_count = len(re.findall(r'[\u4e00-\u9fff]', text))
+    other_count = len(text) - cjk_count
+    return cjk_count + (other_count + 3) // 4
+
+
+class StreamCancellationStats:
+    """流式生成统计（进程内计数），记录客户端断开后取消上游生成所节省的token"""
+    
+    def __init__(self):
+        self.completed_streams = 0
+        self.completed_tokens = 0
+        self.cancelled_streams = 0
+        self.tokens_generated_before_cancel = 0
+        self.tokens_saved = 0
+    
+    def record_completed(self, generated_tokens: int):
+        """记录一次正常结束的流式生成"""
+        self.completed_streams += 1
+        self.completed_tokens += generated_tokens
+    
+    def record_cancelled(self, generated_tokens: int, max_tokens: int):
+        """记录一次被取消的流式生成，并按历史平均长度估算节省的token"""
+        if self.completed_streams:
+            expected_tokens = self.completed_tokens / self.completed_streams
+        else:
+            expected_tokens = max_tokens
+        
+        self.cancelled_streams += 1
+        self.tokens_generated_before_cancel += generated_tokens
+        self.tokens_saved += max(0, round(min(expected_tokens, max_tokens)) - generated_tokens)
+    
+    def snapshot(self) -> Dict[str, int]:
+        """返回当前统计数据"""
+        return {
+            "completed_streams": self.completed_streams,
+            "cancelled_streams": self.cancelled_streams,
+            "tokens_generated_before_cancel": self.tokens_generated_before_cancel,
+            "tokens_saved": self.tokens_saved
+        }
+
+
+stream_stats = StreamCancellationStats()
+
 
 class OpenRouterService:
     """OpenRouter API服务类，用于访问Gemini-2.5-flash模型进行简历分析和优化"""
@@ -17,8 +71,12 @@ class OpenRouterService:
             "X-Title": "Chat Resume AI Assistant"  # 可选，用于OpenRouter统计
         }
     
-    async def chat_completion(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> Dict[str, Any]:
-        """调用 OpenRouter Chat API（OpenAI兼容格式）"""
+    async def chat_completion(self, messages: List[Dict[str, str]], temperature: float = 0.7, response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """调用 OpenRouter Chat API（OpenAI兼容格式）
+        
+        response_format 会原样传给API（如 {"type": "json_schema", ...}），用于约束结构化输出；
+        未启用结构化输出或模型不支持时按普通输出调用。
+        """
         url = f"{self.api_base}/chat/completions"
         
         # 转换消息格式为OpenAI格式
@@ -39,13 +97,24 @@ class OpenRouterService:
             "stream": False
         }
         
+        if response_format and settings.LLM_STRUCTURED_OUTPUT:
+            payload["response_format"] = response_format
+        
         async with httpx.AsyncClient() as client:
             response = await client.post(url, json=payload, headers=self.headers)
+            # 模型不支持 response_format 时去掉后重试一次
+            if response.status_code == 400 and "response_format" in payload:
+                print(f"模型 {self.model} 不支持结构化输出，改为普通输出: {response.text[:200]}")
+                payload.pop("response_format")
+                response = await client.post(url, json=payload, headers=self.headers)
             response.raise_for_status()
             return response.json()
     
     async def chat_completion_stream(self, messages: List[Dict[str, str]], temperature: float = 0.7):
-        """调用 OpenRouter Chat API（流式传输）"""
+        """调用 OpenRouter Chat API（流式传输）
+        
+        调用方对本生成器执行 aclose() 时会立即关闭上游httpx连接，停止继续生成。
+        """
         url = f"{self.api_base}/chat/completions"
         
         # 转换消息格式为OpenAI格式
@@ -58,37 +127,48 @@ class OpenRouterService:
                     "content": message["content"]
                 })
         
+        max_tokens = 2000
         payload = {
             "model": self.model,
             "messages": openai_messages,
             "temperature": temperature,
-            "max_tokens": 2000,
+            "max_tokens": max_tokens,
             "stream": True
         }
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            async with client.stream('POST', url, json=payload, headers=self.headers) as response:
-                response.raise_for_status()
-                
-                async for line in response.aiter_lines():
-                    if line.startswith('data: '):
-                        data_str = line[6:]  # 移除 'data: ' 前缀
-                        
-                        if data_str.strip() == '[DONE]':
-                            break
-                            
-                        try:
-                            import json
-                            data = json.loads(data_str)
+        generated_tokens = 0
+        
+        try:
+            async with httpx.AsyncClient(timeout=60.0) as client:
+                async with client.stream('POST', url, json=payload, headers=self.headers) as response:
+                    response.raise_for_status()
+                    
+                    async for line in response.aiter_lines():
+                        if line.startswith('data: '):
+                            data_str = line[6:]  # 移除 'data: ' 前缀
                             
-                            if 'choices' in data and len(data['choices']) > 0:
-                                delta = data['choices'][0].get('delta', {})
-                                if 'content' in delta:
-                                    content = delta['content']
-                                    if content:
-                                        yield content
-                        except json.JSONDecodeError:
-                            continue
+                            if data_str.strip() == '[DONE]':
+                                break
+                                
+                            try:
+                                import json
+                                data = json.loads(data_str)
+                                
+                                if 'choices' in data and len(data['choices']) > 0:
+                                    delta = data['choices'][0].get('delta', {})
+                                    if 'content' in delta:
+                                        content = delta['content']
+                                        if content:
+                                            generated_tokens += estimate_tokens(content)
+                                            yield content
+                            except json.JSONDecodeError:
+                                continue
+            
+            stream_stats.record_completed(generated_tokens)
+        except (GeneratorExit, asyncio.CancelledError):
+            # 生成器被提前关闭（客户端断开），退出async with时已断开上游连接
+            stream_stats.record_cancelled(generated_tokens, max_tokens)
+            raise
     
     async def analyze_resume_jd_match(self, resume_content: Dict[str, Any], jd_content: str) -> Dict[str, Any]:
         """分析简历与JD的匹配度"""
@@ -96,16 +176,47 @@ class OpenRouterService:
         # 使用新的提示词管理系统
         messages = ResumeAssistantPrompts.build_analysis_messages(resume_content, jd_content)
         
-        response = await self.chat_completion(messages)
+        response = await self.chat_completion(
+            messages,
+            response_format=json_schema_response_format(ResumeMatchAnalysis, "resume_match_analysis")
+        )
         return self._parse_optimization_response(response)
     
+    async def analyze_resume_sections_match(self, sections: Dict[str, Tuple[str, Any]], jd_content: str, resume_overview: str = "") -> Dict[str, Dict[str, Any]]:
+        """一次调用分析多个简历模块与JD的匹配度，返回 模块字段名 -> 分析结果（结果中缺少的模块不返回）"""
+        
+        messages = ResumeAssistantPrompts.build_sections_analysis_messages(sections, jd_content, resume_overview)
+        
+        response = await self.chat_completion(
+            messages,
+            response_format=json_schema_response_format(ResumeSectionsMatchAnalysis, "resume_sections_match_analysis")
+        )
+        content = response["choices"][0]["message"]["content"]
+        
+        # 各模块结果无法按文本拆分，解析失败时由调用方按分析失败处理
+        result = parse_structured(content, ResumeSectionsMatchAnalysis)
+        return {
+            item.section: {
+                "content": item.analysis,
+                "suggestions": item.suggestions,
+                "score": item.score,
+                "missing_skills": item.missing_skills,
+                "matched_skills": item.matched_skills
+            }
+            for item in result.sections
+            if item.section in sections
+        }
+    
     async def generate_interview_questions(self, resume_content: Dict[str, Any], jd_content: str = "") -> List[Dict[str, str]]:
         """根据简历和JD生成面试问题"""
         
         # 使用新的提示词管理系统
         messages = ResumeAssistantPrompts.build_interview_questions_messages(resume_content, jd_content if jd_content else None)
         
-        response = await self.chat_completion(messages)
+        response = await self.chat_completion(
+            messages,
+            response_format=json_schema_response_format(InterviewQuestionList, "interview_questions")
+        )
         return self._parse_interview_questions(response)
     
     async def evaluate_interview_answer(self, question: str, answer: str, resume_content: Dict[str, Any]) -> Dict[str, Any]:
@@ -209,7 +320,19 @@ class OpenRouterService:
         """解析优化建议响应（OpenAI格式）"""
         content = response["choices"][0]["message"]["content"]
         
-        # 简单的文本解析，实际应用中可能需要更复杂的解析逻辑
+        try:
+            result = parse_structured(content, ResumeMatchAnalysis)
+            return {
+                "content": result.analysis or content,
+                "suggestions": result.suggestions,
+                "score": result.score,
+                "missing_skills": result.missing_skills,
+                "matched_skills": result.matched_skills
+            }
+        except StructuredOutputError as e:
+            print(f"匹配分析结果不是有效JSON，按文本解析: {e}")
+        
+        # 非JSON输出时按文本解析
         return {
             "content": content,
             "suggestions": self._extract_suggestions(content),
@@ -221,7 +344,16 @@ class OpenRouterService:
         """解析面试问题响应（OpenAI格式）"""
         content = response["choices"][0]["message"]["content"]
         
-        # 简单的文本解析，提取问题
+        try:
+            result = parse_structured(content, InterviewQuestionList)
+            return [
+                {"question": item.question.strip(), "type": item.type or "general"}
+                for item in result.questions
+            ]
+        except StructuredOutputError as e:
+            print(f"面试问题结果不是有效JSON，按文本解析: {e}")
+        
+        # 非JSON输出时按文本解析，提取问题
         questions = []
         lines = content.split('\n')
         current_question = ""
@@ -252,7 +384,7 @@ class OpenRouterService:
         
         return {
             "content": content,
-            "score": 3,  # 默认给中等分数，因为现在不强调评分
+            "score": None,  # 对话式回应没有真实评分，不填占位分数
             "feedback": content,  # 直接使用面试官的回应作为反馈
             "suggestions": []  # 不再强制提取建议
         }
@@ -314,7 +446,7 @@ class OpenRouterService:
             for answer in answers:
                 if isinstance(answer, dict) and 'evaluation' in answer:
                     evaluation = answer['evaluation']
-                    if isinstance(evaluation, dict) and 'score' in evaluation:
+                    if isinstance(evaluation, dict) and evaluation.get('score') is not None:
                         scores.append(evaluation['score'])
             
             if not scores:
@@ -0,0 +1,160 @@
+"""
+简历增量优化服务
+按简历模块分别分析并保存模块内容哈希，再次针对同一岗位优化时，
+只有内容变化的模块才重新分析（合并为一次LLM调用），其余模块沿用上一条优化记录的结果
+"""
+
+import hashlib
+import json
+from typing import Dict, Any, List, Tuple
+from sqlalchemy.orm import Session
+from app.models.resume import OptimizationRecord, Resume
+from app.services.openrouter_service import OpenRouterService
+
+
+class IncrementalOptimizationService:
+    """按模块增量分析简历与JD的匹配度"""
+
+    # 参与匹配分析的模块字段 -> 展示名称（个人信息只用于候选人概况，不单独评分）
+    SECTIONS = {
+        "education": "教育背景",
+        "work_experience": "工作经历",
+        "skills": "专业技能",
+        "projects": "项目经历"
+    }
+
+    # 整体分数中各模块的权重（只在有分数的模块间归一化）
+    SECTION_WEIGHTS = {
+        "education": 0.15,
+        "work_experience": 0.35,
+        "skills": 0.25,
+        "projects": 0.25
+    }
+
+    # 提示词或解析逻辑变化时更新，使旧的模块结果失效
+    ANALYZER_VERSION = "3"
+
+    def __init__(self):
+        self.openrouter_service = OpenRouterService()
+
+    def section_hash(self, section: str, value: Any) -> str:
+        """模块内容哈希"""
+        payload = json.dumps(
+            {"section": section, "value": value, "analyzer": self.ANALYZER_VERSION},
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def optimize(self, db: Session, resume: Resume, jd_content: str) -> Dict[str, Any]:
+        """分析简历与JD的匹配度，返回与整体分析相同结构的结果，并附带各模块结果"""
+        previous_sections = self._previous_sections(db, resume.id, jd_content)
+        overview = self._resume_overview(resume.content)
+
+        sections: Dict[str, Dict[str, Any]] = {}
+        pending: List[Tuple[str, Any, str]] = []
+
+        for section in self.SECTIONS:
+            value = resume.content.get(section)
+            digest = self.section_hash(section, value)
+            previous = previous_sections.get(section)
+
+            if previous and previous.get("hash") == digest:
+                sections[section] = previous
+            elif not value:
+                sections[section] = self._empty_result(digest)
+            else:
+                pending.append((section, value, digest))
+
+        # 变化的模块在一次调用中一起分析（JD和概况只发送一次）；
+        # 调用失败或结果中缺少的模块不保存，下次重新分析
+        results: Dict[str, Dict[str, Any]] = {}
+        if pending:
+            try:
+                results = await self._analyze_sections(pending, jd_content, overview)
+            except Exception as e:
+                print(f"简历模块分析失败: {e}")
+                # 没有可沿用的模块结果时无法给出分析
+                if not any(result.get("content") for result in sections.values()):
+                    raise
+
+        failed_sections = []
+        for section, _, digest in pending:
+            if section in results:
+                sections[section] = {**results[section], "hash": digest}
+            else:
+                failed_sections.append(section)
+
+        merged = self._merge(sections)
+        merged["incremental"] = {
+            "analyzed_sections": [section for section, _, _ in pending if section not in failed_sections],
+            "failed_sections": failed_sections,
+            "reused_sections": [
+                section for section in self.SECTIONS
+                if section in previous_sections and sections[section] is previous_sections[section]
+            ]
+        }
+        return merged
+
+    def _previous_sections(self, db: Session, resume_id: int, jd_content: str) -> Dict[str, Dict[str, Any]]:
+        """取同一简历、同一JD最近一次带模块结果的优化记录"""
+        records = db.query(OptimizationRecord.suggestions).filter(
+            OptimizationRecord.resume_id == resume_id,
+            OptimizationRecord.jd_content == jd_content
+        ).order_by(OptimizationRecord.id.desc()).limit(5).all()
+
+        for (suggestions,) in records:
+            if isinstance(suggestions, dict) and isinstance(suggestions.get("sections"), dict):
+                return suggestions["sections"]
+        return {}
+
+    async def _analyze_sections(self, pending: List[Tuple[str, Any, str]], jd_content: str, overview: str) -> Dict[str, Dict[str, Any]]:
+        """调用LLM一次分析多个模块"""
+        return await self.openrouter_service.analyze_resume_sections_match(
+            {section: (self.SECTIONS[section], value) for section, value, _ in pending},
+            jd_content,
+            overview
+        )
+
+    def _resume_overview(self, resume_content: Dict[str, Any]) -> str:
+        """简短的候选人概况，为单模块分析提供上下文"""
+        personal_info = resume_content.get("personal_info") or {}
+        parts = [personal_info.get("name"), personal_info.get("position")]
+        return "，".join(str(part) for part in parts if part)
+
+    def _empty_result(self, digest: str) -> Dict[str, Any]:
+        return {"content": "", "suggestions": [], "score": None, "matched_skills": [], "missing_skills": [], "hash": digest}
+
+    def _merge(self, sections: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """合并各模块结果：分数按模块权重加权平均，建议和技能按模块顺序合并去重"""
+        weighted_sum = 0.0
+        weight_total = 0.0
+        content_parts = []
+        suggestions: List[str] = []
+        matched_skills: List[str] = []
+        missing_skills: List[str] = []
+
+        for section, title in self.SECTIONS.items():
+            result = sections.get(section)
+            if not result:
+                continue
+            if result.get("score") is not None:
+                weight = self.SECTION_WEIGHTS[section]
+                weighted_sum += result["score"] * weight
+                weight_total += weight
+            if result.get("content"):
+                content_parts.append(f"## {title}\n\n{result['content']}")
+            for target, key in ((suggestions, "suggestions"), (matched_skills, "matched_skills"), (missing_skills, "missing_skills")):
+                for item in result.get(key) or []:
+                    if item not in target:
+                        target.append(item)
+
+        return {
+            "content": "\n\n".join(content_parts),
+            "suggestions": suggestions,
+            "score": round(weighted_sum / weight_total) if weight_total else 0,
+            "matched_skills": matched_skills,
+            "missing_skills": missing_skills,
+            "sections": sections
+        }
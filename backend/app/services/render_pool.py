@@ -0,0 +1,129 @@
+"""
+导出渲染进程池
+reportlab / python-docx 渲染是CPU密集的同步操作，放到独立进程中执行，避免阻塞事件循环
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional
+from docx import Document
+from app.core.config import settings
+from app.services.export_service import ExportService, get_pdf_styles
+
+
+class RenderQueueFullError(Exception):
+    """渲染队列已满"""
+    pass
+
+
+class RenderTimeoutError(Exception):
+    """渲染超时"""
+    pass
+
+
+def _init_render_worker():
+    """渲染进程初始化：预热PDF样式和Word默认模板，使首个请求无需再加载"""
+    get_pdf_styles()
+    Document()
+
+
+def _warm_up_worker() -> None:
+    """预热任务：短暂占用进程，使每个预热任务分配到不同的渲染进程"""
+    time.sleep(0.2)
+
+
+def _render_in_worker(resume_content: Dict[str, Any], export_format: str, template: str) -> str:
+    """在渲染进程中执行导出，返回文件路径"""
+    return ExportService().export(resume_content, export_format, template)
+
+
+def _render_bytes_in_worker(resume_content: Dict[str, Any], export_format: str, template: str) -> bytes:
+    """在渲染进程中于内存渲染导出内容"""
+    return ExportService().render_to_bytes(resume_content, export_format, template)
+
+
+class RenderPool:
+    """导出渲染进程池，限制排队深度并为每次渲染设置超时"""
+
+    def __init__(self, max_workers: int, queue_limit: int, timeout: float):
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        # 已提交且尚未在进程中结束的渲染数，包括等待超时后仍在进程中运行的渲染
+        self.in_flight = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_render_worker
+            )
+        return self._executor
+
+    async def warm_up(self) -> None:
+        """启动全部渲染进程并完成初始化，避免首次导出时再创建进程"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(*[
+            loop.run_in_executor(executor, _warm_up_worker)
+            for _ in range(self.max_workers)
+        ])
+
+    async def render(self, resume_content: Dict[str, Any], export_format: str, template: str = "default") -> str:
+        """提交渲染任务；内容未变化且文件已存在时直接返回，不占用渲染进程"""
+        export_service = ExportService()
+        cached_path = export_service.get_cached_path(resume_content, export_format, template)
+        if os.path.exists(cached_path):
+            export_service.mark_used(cached_path)
+            return cached_path
+
+        return await self._submit(_render_in_worker, resume_content, export_format, template)
+
+    async def render_bytes(self, resume_content: Dict[str, Any], export_format: str, template: str = "default") -> bytes:
+        """提交内存渲染任务，返回文件内容"""
+        return await self._submit(_render_bytes_in_worker, resume_content, export_format, template)
+
+    async def _submit(self, func, resume_content: Dict[str, Any], export_format: str, template: str):
+        """在进程池中执行渲染函数，超出排队深度或超时时抛出异常"""
+        if self.in_flight >= self.queue_limit:
+            raise RenderQueueFullError(f"导出队列已满（{self.in_flight}个任务排队中），请稍后重试")
+
+        loop = asyncio.get_running_loop()
+        future = self._get_executor().submit(
+            func,
+            resume_content,
+            export_format,
+            template or "default"
+        )
+        # 按进程中的实际完成计数：超时只会放弃等待，已开始的渲染仍占用进程直到完成
+        self.in_flight += 1
+        future.add_done_callback(lambda _: self._on_done(loop))
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise RenderTimeoutError(f"导出渲染超时（{self.timeout}秒）")
+
+    def _on_done(self, loop: asyncio.AbstractEventLoop) -> None:
+        """渲染在进程中结束（或排队时被取消）后释放名额，回调在进程池的管理线程中执行"""
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(self._release)
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+
+    def shutdown(self) -> None:
+        """关闭进程池"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+render_pool = RenderPool(
+    max_workers=settings.EXPORT_RENDER_WORKERS,
+    queue_limit=settings.EXPORT_RENDER_QUEUE_LIMIT,
+    timeout=settings.EXPORT_RENDER_TIMEOUT
+)
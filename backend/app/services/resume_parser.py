@@ -1,9 +1,11 @@
 import os
-import json
 import asyncio
 from typing import Dict, Any, Optional
 import httpx
 from dotenv import load_dotenv
+from app.core.config import settings
+from app.core.structured_output import StructuredOutputError, json_schema_response_format, parse_structured
+from app.schemas.resume import ParsedResume
 from app.services.file_service import FileService
 
 # 加载环境变量
@@ -105,32 +107,40 @@ class AIResumeParser:
                 
                 print(f"[DEBUG] 动态超时配置: 连接{timeout_config.connect}s, 读取{timeout_config.read}s")
                 
-                async with httpx.AsyncClient(timeout=timeout_config) as client:
-                    response = await client.post(
-                        f"{self.api_base}/chat/completions",
-                        headers={
-                            "Authorization": f"Bearer {self.api_key}",
-                            "Content-Type": "application/json",
-                            "HTTP-Referer": "https://chat-resume.com",
-                            "X-Title": "Chat Resume Parser"
+                payload = {
+                    "model": self.model,
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "你是一个专业的简历解析助手，擅长将简历文本转换为结构化的JSON数据。"
                         },
-                        json={
-                            "model": self.model,
-                            "messages": [
-                                {
-                                    "role": "system",
-                                    "content": "你是一个专业的简历解析助手，擅长将简历文本转换为结构化的JSON数据。"
-                                },
-                                {
-                                    "role": "user",
-                                    "content": prompt
-                                }
-                            ],
-                            "temperature": 0.1,
-                            "max_tokens": 4000,
-                            "stream": False
+                        {
+                            "role": "user",
+                            "content": prompt
                         }
-                    )
+                    ],
+                    "temperature": 0.1,
+                    "max_tokens": 4000,
+                    "stream": False
+                }
+                # 按解析结果模型约束输出格式
+                if settings.LLM_STRUCTURED_OUTPUT:
+                    payload["response_format"] = json_schema_response_format(ParsedResume, "parsed_resume")
+                
+                headers = {
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                    "HTTP-Referer": "https://chat-resume.com",
+                    "X-Title": "Chat Resume Parser"
+                }
+                
+                async with httpx.AsyncClient(timeout=timeout_config) as client:
+                    response = await client.post(f"{self.api_base}/chat/completions", headers=headers, json=payload)
+                    # 模型不支持 response_format 时去掉后重试
+                    if response.status_code == 400 and "response_format" in payload:
+                        print(f"[WARNING] 模型不支持结构化输出，改为普通输出: {response.text[:200]}")
+                        payload.pop("response_format")
+                        response = await client.post(f"{self.api_base}/chat/completions", headers=headers, json=payload)
                 
                 print(f"[DEBUG] HTTP状态码: {response.status_code}")
                 print(f"[DEBUG] 响应头: {dict(response.headers)}")
@@ -249,69 +259,22 @@ class AIResumeParser:
 **再次提醒：只返回JSON数据，不要添加任何解释文字！**"""
     
     def _parse_ai_response(self, ai_content: str) -> Dict[str, Any]:
-        """解析AI返回的JSON内容"""
+        """解析AI返回的JSON内容
+        
+        代码块标记、前后说明文字、尾逗号、被截断的结尾等格式问题先在本地修复，
+        再按解析结果模型校验；仍然失败时抛出异常，由调用方重试
+        """
+        print(f"[DEBUG] 开始解析AI响应，长度: {len(ai_content)}")
         try:
-            print(f"[DEBUG] 开始解析AI响应，长度: {len(ai_content)}")
-            
-            # 尝试多种方式提取JSON
-            json_str = None
-            
-            # 方式1: 寻找完整的JSON对象
-            start_idx = ai_content.find('{')
-            end_idx = ai_content.rfind('}') + 1
-            
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = ai_content[start_idx:end_idx]
-                print(f"[DEBUG] 提取的JSON字符串长度: {len(json_str)}")
-                print(f"[DEBUG] JSON前200字符: {json_str[:200]}")
-            
-            # 方式2: 如果找不到完整JSON，尝试整个内容
-            if not json_str:
-                json_str = ai_content.strip()
-                print(f"[DEBUG] 使用完整响应作为JSON")
-            
-            # 尝试解析JSON
-            if json_str:
-                try:
-                    parsed_data = json.loads(json_str)
-                    print(f"[DEBUG] JSON解析成功，包含字段: {list(parsed_data.keys())}")
-                    return parsed_data
-                except json.JSONDecodeError as e:
-                    print(f"[ERROR] 第一次JSON解析失败: {e}")
-                    
-                    # 尝试清理和修复JSON
-                    cleaned_json = self._clean_json_string(json_str)
-                    print(f"[DEBUG] 尝试清理后的JSON")
-                    parsed_data = json.loads(cleaned_json)
-                    print(f"[DEBUG] 清理后JSON解析成功")
-                    return parsed_data
-            
-            raise ValueError("无法找到有效的JSON格式")
-                
-        except json.JSONDecodeError as e:
-            print(f"[ERROR] 最终JSON解析失败: {e}")
-            print(f"[DEBUG] 失败的JSON内容: {json_str[:1000] if json_str else 'None'}")
+            parsed = parse_structured(ai_content, ParsedResume)
+        except StructuredOutputError as e:
+            print(f"[ERROR] JSON解析失败: {e}")
+            print(f"[DEBUG] 失败的JSON内容: {ai_content[:1000]}")
             raise
-        except Exception as e:
-            print(f"[ERROR] 解析过程出现异常: {type(e).__name__}: {e}")
-            raise
-    
-    def _clean_json_string(self, json_str: str) -> str:
-        """清理和修复JSON字符串"""
-        print(f"[DEBUG] 开始清理JSON字符串")
-        
-        # 移除可能的markdown代码块标记
-        json_str = json_str.replace('```json', '').replace('```', '')
-        
-        # 移除可能的前后空白和换行
-        json_str = json_str.strip()
-        
-        # 移除可能的BOM标记
-        if json_str.startswith('\ufeff'):
-            json_str = json_str[1:]
         
-        print(f"[DEBUG] 清理后JSON长度: {len(json_str)}")
-        return json_str
+        parsed_data = parsed.model_dump(exclude_none=True)
+        print(f"[DEBUG] JSON解析成功，包含字段: {list(parsed_data.keys())}")
+        return parsed_data
     
     def _validate_and_enhance(self, data: Dict[str, Any], original_text: str) -> Dict[str, Any]:
         """验证和增强数据"""
@@ -1,8 +1,13 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from app.models.resume import Resume, OptimizationRecord, InterviewSession
+from app.core.pagination import keyset_page
+from app.models.resume import Resume, ResumeVersion, OptimizationRecord, InterviewSession, InterviewTurn
 from app.schemas.resume import ResumeCreate
+from app.services.embedding_service import EmbeddingService
 from app.services.file_service import FileService
+from app.services.interview_stats_service import InterviewStatsService
+from app.services.resume_version_service import ResumeVersionService
 
 class ResumeService:
     def __init__(self, db: Session):
@@ -14,17 +19,70 @@ class ResumeService:
     def get_by_owner(self, owner_id: int) -> List[Resume]:
         return self.db.query(Resume).filter(Resume.owner_id == owner_id).all()
     
+    def get_page_by_owner(self, owner_id: int, limit: Optional[int] = None, cursor: Optional[int] = None, summary: bool = False) -> Tuple[list, Optional[int]]:
+        """分页获取用户简历；summary 为True时只查询列表所需的列，不读取 content"""
+        if summary:
+            query = self.db.query(
+                Resume.id,
+                Resume.title,
+                Resume.original_filename,
+                Resume.owner_id,
+                Resume.version,
+                Resume.created_at,
+                Resume.updated_at
+            )
+        else:
+            query = self.db.query(Resume)
+        
+        return keyset_page(query.filter(Resume.owner_id == owner_id), Resume.id, limit, cursor)
+    
+    def get_interview_session_summaries(self, owner_id: int, resume_id: Optional[int] = None, limit: Optional[int] = None, cursor: Optional[int] = None) -> Tuple[list, Optional[int]]:
+        """分页获取面试会话摘要：联表取简历标题，问题数和回答数由数据库计算，不读取大JSON列"""
+        query = self.db.query(
+            InterviewSession.id,
+            InterviewSession.resume_id,
+            Resume.title.label("resume_title"),
+            InterviewSession.job_position,
+            InterviewSession.interview_mode,
+            InterviewSession.status,
+            InterviewSession.overall_score,
+            select(func.count(InterviewTurn.id)).where(
+                InterviewTurn.session_id == InterviewSession.id
+            ).scalar_subquery().label("question_count"),
+            select(func.count(InterviewTurn.id)).where(
+                InterviewTurn.session_id == InterviewSession.id,
+                InterviewTurn.answer.isnot(None)
+            ).scalar_subquery().label("answer_count"),
+            InterviewSession.created_at,
+            InterviewSession.updated_at
+        ).join(Resume, InterviewSession.resume_id == Resume.id).filter(
+            Resume.owner_id == owner_id
+        )
+        
+        if resume_id is not None:
+            query = query.filter(InterviewSession.resume_id == resume_id)
+        
+        return keyset_page(query.order_by(InterviewSession.id.desc()), InterviewSession.id, limit, cursor)
+    
     def create(self, resume_create: ResumeCreate, owner_id: int) -> Resume:
         """创建简历记录"""
+        # 原始文本单独压缩保存，content 只保留结构化字段
+        content = dict(resume_create.content)
+        raw_text = content.pop("raw_text", None)
+        
         resume = Resume(
             title=resume_create.title,
-            content=resume_create.content,
+            content=content,
             original_filename=resume_create.original_filename,
             owner_id=owner_id
         )
+        resume.raw_text = raw_text
         
         try:
             self.db.add(resume)
+            self.db.flush()
+            ResumeVersionService(self.db).record_initial(resume)
+            EmbeddingService(self.db).index_resume(resume)
             self.db.commit()
             self.db.refresh(resume)
             return resume
@@ -36,13 +94,29 @@ class ResumeService:
             # 重新抛出异常供上层处理
             raise e
     
-    def update(self, resume_id: int, resume_update: dict) -> Resume:
+    def update(self, resume_id: int, resume_update: dict, expected_version: Optional[int] = None) -> Resume:
+        """更新简历；内容变化时追加版本，expected_version 用于乐观并发控制（见 ResumeVersionService.commit_content）"""
         resume = self.get_by_id(resume_id)
         if resume:
-            for key, value in resume_update.items():
-                setattr(resume, key, value)
-            self.db.commit()
-            self.db.refresh(resume)
+            try:
+                # content 中带有原始文本时移到单独的列
+                if isinstance(resume_update.get("content"), dict) and "raw_text" in resume_update["content"]:
+                    resume_update = {**resume_update, "content": dict(resume_update["content"])}
+                    resume.raw_text = resume_update["content"].pop("raw_text")
+                
+                # 内容变化记录为新版本（只保存差异）
+                if "content" in resume_update:
+                    resume_update = dict(resume_update)
+                    ResumeVersionService(self.db).commit_content(resume, resume_update.pop("content"), expected_version)
+                    EmbeddingService(self.db).index_resume(resume)
+                
+                for key, value in resume_update.items():
+                    setattr(resume, key, value)
+                self.db.commit()
+                self.db.refresh(resume)
+            except Exception:
+                self.db.rollback()
+                raise
         return resume
     
     def delete(self, resume_id: int) -> bool:
@@ -53,12 +127,24 @@ class ResumeService:
             return False
         
         try:
+            # 删除简历模块和JD的向量
+            EmbeddingService(self.db).delete_for_resume(resume_id)
+            
             # 删除关联的优化记录
             self.db.query(OptimizationRecord).filter(
                 OptimizationRecord.resume_id == resume_id
             ).delete()
             
-            # 删除关联的面试会话
+            # 删除版本历史
+            self.db.query(ResumeVersion).filter(
+                ResumeVersion.resume_id == resume_id
+            ).delete()
+            
+            # 删除关联的面试轮次和面试会话
+            session_ids = select(InterviewSession.id).where(InterviewSession.resume_id == resume_id)
+            self.db.query(InterviewTurn).filter(
+                InterviewTurn.session_id.in_(session_ids)
+            ).delete(synchronize_session=False)
             self.db.query(InterviewSession).filter(
                 InterviewSession.resume_id == resume_id
             ).delete()
@@ -68,6 +154,9 @@ class ResumeService:
                 file_service = FileService()
                 file_service.delete_file(resume.file_path)
             
+            # 面试统计汇总按用户保存，批量删除会话后下次读取时重建
+            InterviewStatsService(self.db).invalidate(resume.owner_id)
+            
             # 删除简历记录
             self.db.delete(resume)
             self.db.commit()
@@ -0,0 +1,125 @@
+"""
+简历版本服务
+每次内容变化只保存相对上一版本的 JSON Patch，每隔固定版本数保存一次完整快照，
+读取历史版本时从最近的快照开始依次应用补丁
+"""
+
+from typing import Any, Dict, List, Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from app.core.config import settings
+from app.core.json_patch import apply_json_patch, make_json_patch
+from app.models.resume import Resume, ResumeVersion
+
+
+class VersionConflictError(Exception):
+    """简历版本已被其他请求修改"""
+    pass
+
+
+class ResumeVersionService:
+    """简历内容版本链"""
+
+    MAX_COMMIT_ATTEMPTS = 3  # 未指定期望版本时，并发冲突后基于最新版本重试的次数
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def version_token(resume: Resume) -> str:
+        """版本令牌（ETag 格式），用于 If-Match 乐观并发控制和按版本失效缓存"""
+        return f'"{resume.version}"'
+
+    def record_initial(self, resume: Resume) -> None:
+        """为新建的简历保存第一个快照，调用方负责提交事务"""
+        self.db.add(ResumeVersion(
+            resume_id=resume.id,
+            version=resume.version or 1,
+            snapshot=resume.content
+        ))
+
+    def commit_content(self, resume: Resume, new_content: Dict[str, Any], expected_version: Optional[int] = None) -> bool:
+        """写入新内容并追加一个版本，内容无变化时返回 False；调用方负责提交事务
+
+        版本号在数据库中按条件原子递增（仅当版本仍为读取时的值），并发写入不会得到相同的版本号。
+        指定 expected_version 时版本不一致即抛出 VersionConflictError；
+        未指定时重新加载最新版本后重试（后写入者生效）。
+        """
+        for _ in range(self.MAX_COMMIT_ATTEMPTS):
+            base_version = resume.version or 1
+            if expected_version is not None and base_version != expected_version:
+                raise VersionConflictError(f"Resume {resume.id} is at version {base_version}, expected {expected_version}")
+
+            operations = make_json_patch(resume.content, new_content)
+            if not operations:
+                return False
+
+            result = self.db.execute(
+                update(Resume)
+                .where(Resume.id == resume.id, Resume.version == base_version)
+                .values(content=new_content, version=Resume.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                new_version = base_version + 1
+                set_committed_value(resume, "content", new_content)
+                set_committed_value(resume, "version", new_version)
+
+                if new_version % settings.RESUME_SNAPSHOT_INTERVAL == 0:
+                    version = ResumeVersion(resume_id=resume.id, version=new_version, snapshot=new_content)
+                else:
+                    version = ResumeVersion(resume_id=resume.id, version=new_version, patch=operations)
+                self.db.add(version)
+                return True
+
+            if expected_version is not None:
+                raise VersionConflictError(f"Resume {resume.id} was modified concurrently")
+
+            # 其他请求已写入新版本，重新加载后基于最新内容生成补丁
+            self.db.expire(resume, ["content", "version"])
+
+        raise VersionConflictError(f"Resume {resume.id} kept changing while saving")
+
+    def get_content(self, resume_id: int, version: int) -> Optional[Dict[str, Any]]:
+        """还原指定版本的内容，版本不存在时返回 None"""
+        snapshot = self.db.query(ResumeVersion).filter(
+            ResumeVersion.resume_id == resume_id,
+            ResumeVersion.version <= version,
+            ResumeVersion.snapshot.isnot(None)
+        ).order_by(ResumeVersion.version.desc()).first()
+
+        if snapshot is None:
+            return None
+
+        patches = self.db.query(ResumeVersion.version, ResumeVersion.patch).filter(
+            ResumeVersion.resume_id == resume_id,
+            ResumeVersion.version > snapshot.version,
+            ResumeVersion.version <= version
+        ).order_by(ResumeVersion.version).all()
+
+        # 版本链必须连续
+        if len(patches) != version - snapshot.version:
+            return None
+
+        content = snapshot.snapshot
+        for _, patch in patches:
+            content = apply_json_patch(content, patch)
+        return content
+
+    def list_versions(self, resume_id: int) -> List[Dict[str, Any]]:
+        """列出版本（不含内容）"""
+        rows = self.db.query(
+            ResumeVersion.version,
+            ResumeVersion.snapshot.isnot(None).label("is_snapshot"),
+            ResumeVersion.created_at
+        ).filter(ResumeVersion.resume_id == resume_id).order_by(ResumeVersion.version.desc()).all()
+
+        return [
+            {
+                "version": row.version,
+                "kind": "snapshot" if row.is_snapshot else "patch",
+                "created_at": row.created_at
+            }
+            for row in rows
+        ]
@@ -0,0 +1,177 @@
+"""
+面试分数回填服务
+在后台为已完成但没有分数的面试计算分数：分批读取、并发受限、逐会话提交，可随时中断后重新运行
+"""
+
+import asyncio
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.resume import InterviewSession, Resume
+from app.services.interview_scoring_service import InterviewScoringService
+from app.services.interview_stats_service import InterviewStatsService
+
+
+@dataclass
+class BackfillJob:
+    """分数回填任务状态"""
+    job_id: str
+    resume_id: int
+    status: str = "pending"  # pending, running, completed, failed
+    total_count: int = 0
+    processed_count: int = 0
+    updated_count: int = 0
+    skipped_count: int = 0
+    failed_count: int = 0
+    errors: List[str] = field(default_factory=list)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """返回任务进度"""
+        return {
+            "job_id": self.job_id,
+            "resume_id": self.resume_id,
+            "status": self.status,
+            "total_count": self.total_count,
+            "processed_count": self.processed_count,
+            "updated_count": self.updated_count,
+            "skipped_count": self.skipped_count,
+            "failed_count": self.failed_count,
+            "progress": round(self.processed_count / self.total_count * 100, 1) if self.total_count else 100.0,
+            "errors": self.errors[-10:],
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+class ScoreBackfillService:
+    """面试分数回填服务（进程内任务表，每份简历同时只运行一个任务）
+
+    进度以数据库为检查点：每个会话计算完成后立即提交，已有分数的会话不会被重复处理，
+    因此任务中断（如进程重启）后再次启动即可从剩余会话继续。
+    """
+
+    _jobs: Dict[int, BackfillJob] = {}
+    _tasks: Dict[int, asyncio.Task] = {}
+
+    def start(self, resume_id: int) -> BackfillJob:
+        """启动回填任务；该简历已有运行中的任务时直接返回该任务"""
+        self._evict_finished()
+        task = self._tasks.get(resume_id)
+        if task and not task.done():
+            return self._jobs[resume_id]
+
+        job = BackfillJob(job_id=uuid.uuid4().hex, resume_id=resume_id)
+        self._jobs[resume_id] = job
+        task = asyncio.create_task(self._run(job))
+        self._tasks[resume_id] = task
+        task.add_done_callback(lambda t: self._discard_task(resume_id, t))
+        return job
+
+    def get_job(self, resume_id: int) -> Optional[BackfillJob]:
+        """获取该简历最近一次回填任务"""
+        self._evict_finished()
+        return self._jobs.get(resume_id)
+
+    def _discard_task(self, resume_id: int, task: asyncio.Task) -> None:
+        """任务结束后从任务表移除，任务进度仍保留在 _jobs 中供查询"""
+        if self._tasks.get(resume_id) is task:
+            del self._tasks[resume_id]
+
+    def _evict_finished(self) -> None:
+        """移除结束时间超过保留期的任务进度"""
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.SCORE_BACKFILL_JOB_TTL)
+        for resume_id, job in list(self._jobs.items()):
+            if job.finished_at and job.finished_at < cutoff and resume_id not in self._tasks:
+                del self._jobs[resume_id]
+
+    def _unscored_query(self, db, resume_id: int):
+        return db.query(InterviewSession.id).filter(
+            InterviewSession.resume_id == resume_id,
+            InterviewSession.status == "completed",
+            InterviewSession.overall_score.is_(None)
+        )
+
+    async def _run(self, job: BackfillJob) -> None:
+        """按ID分批处理待计算会话"""
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        semaphore = asyncio.Semaphore(settings.SCORE_BACKFILL_CONCURRENCY)
+        scoring_service = InterviewScoringService()
+
+        try:
+            db = SessionLocal()
+            try:
+                job.total_count = self._unscored_query(db, job.resume_id).count()
+            finally:
+                db.close()
+
+            last_id = 0
+            while True:
+                db = SessionLocal()
+                try:
+                    batch_ids = [
+                        row.id for row in self._unscored_query(db, job.resume_id).filter(
+                            InterviewSession.id > last_id
+                        ).order_by(InterviewSession.id).limit(settings.SCORE_BACKFILL_BATCH_SIZE).all()
+                    ]
+                finally:
+                    db.close()
+
+                if not batch_ids:
+                    break
+                last_id = batch_ids[-1]
+
+                await asyncio.gather(*[
+                    self._score_session(job, session_id, semaphore, scoring_service)
+                    for session_id in batch_ids
+                ])
+
+            job.status = "completed"
+        except Exception as e:
+            job.status = "failed"
+            job.errors.append(f"任务异常终止: {e}")
+            print(f"面试分数回填任务失败 (简历 {job.resume_id}): {e}")
+        finally:
+            job.finished_at = datetime.utcnow()
+
+    async def _score_session(self, job: BackfillJob, session_id: int, semaphore: asyncio.Semaphore, scoring_service: InterviewScoringService) -> None:
+        """计算单个会话分数并立即提交"""
+        async with semaphore:
+            db = SessionLocal()
+            try:
+                session = db.query(InterviewSession).filter(InterviewSession.id == session_id).first()
+
+                # 会话可能已被删除或在其他地方计算过分数
+                if not session or session.overall_score is not None:
+                    job.skipped_count += 1
+                    return
+
+                overall_score = await scoring_service.calculate_session_overall_score(session)
+
+                if overall_score > 0:  # 只有成功计算出分数才更新
+                    owner_id = db.query(Resume.owner_id).filter(Resume.id == session.resume_id).scalar()
+                    InterviewStatsService(db).apply_session_change(
+                        owner_id, (session.status, None), (session.status, overall_score)
+                    )
+                    session.overall_score = overall_score
+                    db.commit()
+                    job.updated_count += 1
+                else:
+                    job.skipped_count += 1
+
+            except Exception as e:
+                db.rollback()
+                job.failed_count += 1
+                job.errors.append(f"会话 {session_id}: {e}")
+                print(f"Failed to calculate score for session {session_id}: {e}")
+            finally:
+                db.close()
+                job.processed_count += 1
+
+
+score_backfill_service = ScoreBackfillService()
@@ -0,0 +1,173 @@
+"""
+存储清理服务
+定期按过期时间和总容量清理导出文件，清理未被简历引用的上传残留文件，并统计磁盘占用
+"""
+
+import os
+import time
+import asyncio
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.resume import Resume
+
+
+class StorageSweeper:
+    """导出目录与上传目录的后台清理器"""
+
+    def __init__(self):
+        self.upload_dir = settings.UPLOAD_DIR
+        self.export_dir = os.path.join(settings.UPLOAD_DIR, "exports")
+        self.last_run: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _list_files(self, directory: str) -> List[Tuple[str, int, float]]:
+        """列出目录下的普通文件：(路径, 大小, 最近使用时间)
+
+        导出文件被下载或复用时会更新访问时间，因此取访问时间和修改时间中较新的一个。
+        """
+        files = []
+        if not os.path.isdir(directory):
+            return files
+
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name != ".gitkeep":
+                stat = entry.stat()
+                files.append((entry.path, stat.st_size, max(stat.st_atime, stat.st_mtime)))
+        return files
+
+    def _remove(self, filepath: str) -> bool:
+        try:
+            os.remove(filepath)
+            return True
+        except OSError:
+            return False
+
+    def sweep_exports(self) -> Dict[str, int]:
+        """淘汰过期导出文件，并在超出容量预算时按最近下载时间（LRU）继续淘汰"""
+        now = time.time()
+        removed_count = 0
+        removed_bytes = 0
+        kept = []
+
+        for filepath, size, last_used in self._list_files(self.export_dir):
+            # 渲染中的临时文件只在明显残留时清理
+            is_tmp = os.path.basename(filepath).startswith(".tmp_")
+            ttl = settings.EXPORT_RENDER_TIMEOUT * 10 if is_tmp else settings.EXPORT_TTL_SECONDS
+
+            if now - last_used > ttl:
+                if self._remove(filepath):
+                    removed_count += 1
+                    removed_bytes += size
+            elif not is_tmp:
+                kept.append((filepath, size, last_used))
+
+        total_bytes = sum(size for _, size, _ in kept)
+        if total_bytes > settings.EXPORT_DIR_MAX_BYTES:
+            kept.sort(key=lambda item: item[2])
+            for filepath, size, _ in kept:
+                if total_bytes <= settings.EXPORT_DIR_MAX_BYTES:
+                    break
+                if self._remove(filepath):
+                    removed_count += 1
+                    removed_bytes += size
+                    total_bytes -= size
+
+        return {"removed_count": removed_count, "removed_bytes": removed_bytes}
+
+    def sweep_uploads(self) -> Dict[str, int]:
+        """清理未被任何简历引用的上传残留文件，并清除指向不存在文件的 Resume.file_path"""
+        now = time.time()
+        removed_count = 0
+        removed_bytes = 0
+        cleared_references = 0
+
+        db = SessionLocal()
+        try:
+            referenced = set()
+            for resume_id, file_path in db.query(Resume.id, Resume.file_path).filter(Resume.file_path.isnot(None)).all():
+                if os.path.exists(file_path):
+                    referenced.add(os.path.abspath(file_path))
+                else:
+                    db.query(Resume).filter(Resume.id == resume_id).update(
+                        {Resume.file_path: None}, synchronize_session=False
+                    )
+                    cleared_references += 1
+
+            if cleared_references:
+                db.commit()
+        finally:
+            db.close()
+
+        for filepath, size, last_used in self._list_files(self.upload_dir):
+            # 留出宽限期，避免删除正在处理中的上传文件
+            if os.path.abspath(filepath) in referenced or now - last_used < settings.UPLOAD_ORPHAN_GRACE_SECONDS:
+                continue
+            if self._remove(filepath):
+                removed_count += 1
+                removed_bytes += size
+
+        return {
+            "removed_count": removed_count,
+            "removed_bytes": removed_bytes,
+            "cleared_references": cleared_references
+        }
+
+    def disk_usage(self) -> Dict[str, Any]:
+        """统计上传目录和导出目录的文件数量与占用空间"""
+        export_files = self._list_files(self.export_dir)
+        upload_files = self._list_files(self.upload_dir)
+        usage = {
+            "export_file_count": len(export_files),
+            "export_bytes": sum(size for _, size, _ in export_files),
+            "export_budget_bytes": settings.EXPORT_DIR_MAX_BYTES,
+            "upload_file_count": len(upload_files),
+            "upload_bytes": sum(size for _, size, _ in upload_files)
+        }
+
+        try:
+            disk = os.statvfs(self.upload_dir)
+            usage["disk_free_bytes"] = disk.f_bavail * disk.f_frsize
+            usage["disk_total_bytes"] = disk.f_blocks * disk.f_frsize
+        except (OSError, AttributeError):
+            pass
+
+        return usage
+
+    def sweep(self) -> Dict[str, Any]:
+        """执行一次完整清理并记录结果"""
+        result = {
+            "exports": self.sweep_exports(),
+            "uploads": self.sweep_uploads(),
+            "usage": self.disk_usage(),
+            "finished_at": datetime.utcnow()
+        }
+        self.last_run = result
+        return result
+
+    async def run_forever(self) -> None:
+        """按固定间隔在线程中执行清理，避免文件和数据库I/O阻塞事件循环"""
+        while True:
+            try:
+                result = await asyncio.to_thread(self.sweep)
+                removed = result["exports"]["removed_count"] + result["uploads"]["removed_count"]
+                if removed:
+                    print(f"存储清理完成: 删除{removed}个文件, 当前导出目录占用 {result['usage']['export_bytes']} 字节")
+            except Exception as e:
+                print(f"存储清理失败: {e}")
+            await asyncio.sleep(settings.STORAGE_SWEEP_INTERVAL)
+
+    def start(self) -> None:
+        """启动后台清理任务"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+
+    def stop(self) -> None:
+        """停止后台清理任务"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+storage_sweeper = StorageSweeper()
@@ -0,0 +1,64 @@
+"""
+本地文本相似度
+中文按字二元组、英文按单词切分，用TF-IDF余弦相似度快速比较简历与JD，不调用LLM
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List
+
+_WORD_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#.\-]*|[一-鿿]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """切分为词项：英文/数字按单词（保留 c++、c#、node.js 等写法），中文按相邻两字"""
+    tokens = []
+    for match in _WORD_PATTERN.findall((text or "").lower()):
+        if '一' <= match[0] <= '鿿':
+            if len(match) == 1:
+                tokens.append(match)
+            else:
+                tokens.extend(match[i:i + 2] for i in range(len(match) - 1))
+        else:
+            tokens.append(match.rstrip('.-'))
+    return [token for token in tokens if token]
+
+
+def flatten_text(value: Any) -> str:
+    """把简历内容等嵌套结构中的所有文本拼接起来"""
+    if isinstance(value, dict):
+        return "\n".join(flatten_text(item) for item in value.values())
+    if isinstance(value, list):
+        return "\n".join(flatten_text(item) for item in value)
+    if value is None:
+        return ""
+    return str(value)
+
+
+def tfidf_similarities(query: str, documents: List[str]) -> List[float]:
+    """计算 query 与每个文档的TF-IDF余弦相似度（IDF基于传入的文档集合）"""
+    document_counts = [Counter(tokenize(document)) for document in documents]
+    document_frequency = Counter()
+    for counts in document_counts:
+        document_frequency.update(counts.keys())
+
+    total = len(documents)
+    idf = {term: math.log((1 + total) / (1 + df)) + 1 for term, df in document_frequency.items()}
+
+    def weigh(counts: Counter) -> Dict[str, float]:
+        return {term: (1 + math.log(count)) * idf.get(term, math.log(1 + total) + 1) for term, count in counts.items()}
+
+    query_vector = weigh(Counter(tokenize(query)))
+    query_norm = math.sqrt(sum(weight * weight for weight in query_vector.values()))
+
+    similarities = []
+    for counts in document_counts:
+        vector = weigh(counts)
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if not norm or not query_norm:
+            similarities.append(0.0)
+            continue
+        dot = sum(weight * query_vector.get(term, 0.0) for term, weight in vector.items())
+        similarities.append(dot / (norm * query_norm))
+    return similarities
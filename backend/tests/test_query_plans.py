@@ -0,0 +1,66 @@
+"""
+热点查询的执行计划回归测试
+在内存SQLite上建表，EXPLAIN QUERY PLAN 检查每个查询都走索引，而不是全表扫描
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models.resume import InterviewSession, OptimizationRecord, Resume
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def query_plan(db: Session, query) -> list:
+    """返回查询的 EXPLAIN QUERY PLAN 明细行"""
+    statement = query.statement.compile(
+        dialect=db.get_bind().dialect,
+        compile_kwargs={"literal_binds": True}
+    )
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {statement}")).all()
+    return [row[-1] for row in rows]
+
+
+def assert_uses_index(plan: list) -> None:
+    assert any("USING INDEX" in detail or "USING COVERING INDEX" in detail for detail in plan), plan
+    # 不允许不带索引的全表扫描（如 "SCAN interview_sessions"）
+    assert not any(detail.startswith("SCAN") and "USING" not in detail for detail in plan), plan
+
+
+def test_active_session_lookup_uses_index(db):
+    query = db.query(InterviewSession).filter(
+        InterviewSession.resume_id == 1,
+        InterviewSession.status == "active"
+    )
+    assert_uses_index(query_plan(db, query))
+
+
+def test_unscored_backfill_keyset_uses_index(db):
+    query = db.query(InterviewSession.id).filter(
+        InterviewSession.resume_id == 1,
+        InterviewSession.status == "completed",
+        InterviewSession.overall_score.is_(None),
+        InterviewSession.id > 0
+    ).order_by(InterviewSession.id).limit(50)
+    assert_uses_index(query_plan(db, query))
+
+
+def test_resume_listing_by_owner_uses_index(db):
+    query = db.query(Resume).filter(Resume.owner_id == 1).order_by(Resume.id.desc()).limit(20)
+    assert_uses_index(query_plan(db, query))
+
+
+def test_optimization_records_by_resume_uses_index(db):
+    query = db.query(OptimizationRecord).filter(
+        OptimizationRecord.resume_id == 1
+    ).order_by(OptimizationRecord.created_at.desc())
+    assert_uses_index(query_plan(db, query))
@@ -95,9 +95,10 @@ export default function InterviewsPage() {
           // 如果有需要计算分数的面试，先计算分数
           if (needScoreCalculation) {
             try {
-              const result = await interviewApi.calculateScoresForCompletedInterviews(resume.id)
-              if (result.updated_count > 0) {
-                console.log(`为简历ID ${resume.id} 计算了 ${result.updated_count} 个面试的分数`)
+              // 分数在后台任务中计算，轮询到任务结束后再判断是否需要刷新
+              const job = await interviewApi.calculateScoresAndWait(resume.id)
+              if (job.updated_count > 0) {
+                console.log(`为简历ID ${resume.id} 计算了 ${job.updated_count} 个面试的分数`)
                 // 重新获取更新后的面试记录
                 const updatedSessions = await interviewApi.getInterviewSessions(resume.id)
                 const sessionsWithTitle = updatedSessions.map(session => ({
@@ -92,6 +92,21 @@ interface InterviewSession {
   updated_at: string
 }
 
+interface ScoreCalculationJob {
+  job_id: string
+  resume_id: number
+  status: 'pending' | 'running' | 'completed' | 'failed'
+  total_count: number
+  processed_count: number
+  updated_count: number
+  skipped_count: number
+  failed_count: number
+  progress: number
+  errors: string[]
+  started_at?: string
+  finished_at?: string
+}
+
 interface InterviewConfig {
   job_position: string
   interview_mode: string
@@ -385,7 +400,7 @@ class InterviewAPI {
   /**
    * 为已完成面试计算分数
    */
-  static async calculateScoresForCompletedInterviews(resumeId: number): Promise<{message: string, updated_count: number}> {
+  static async calculateScoresForCompletedInterviews(resumeId: number): Promise<{message: string, job: ScoreCalculationJob}> {
     const response = await fetch(`${API_BASE_URL}/api/v1/resumes/${resumeId}/interview/calculate-scores`, {
       method: 'POST',
       headers: {
@@ -393,7 +408,40 @@ class InterviewAPI {
       },
     })
 
-    return handleApiResponse<{message: string, updated_count: number}>(response)
+    return handleApiResponse<{message: string, job: ScoreCalculationJob}>(response)
+  }
+
+  /**
+   * 获取分数计算任务进度
+   */
+  static async getScoreCalculationStatus(resumeId: number): Promise<ScoreCalculationJob> {
+    const response = await fetch(`${API_BASE_URL}/api/v1/resumes/${resumeId}/interview/calculate-scores/status`, {
+      method: 'GET',
+      headers: {
+        ...getAuthHeaders(),
+      },
+    })
+
+    return handleApiResponse<ScoreCalculationJob>(response)
+  }
+
+  /**
+   * 启动分数计算任务并轮询进度，任务结束（或超时）后返回最后一次的任务状态
+   */
+  static async calculateScoresAndWait(
+    resumeId: number,
+    intervalMs: number = 1000,
+    timeoutMs: number = 120000
+  ): Promise<ScoreCalculationJob> {
+    let { job } = await InterviewAPI.calculateScoresForCompletedInterviews(resumeId)
+    const deadline = Date.now() + timeoutMs
+
+    while ((job.status === 'pending' || job.status === 'running') && Date.now() < deadline) {
+      await new Promise(resolve => setTimeout(resolve, intervalMs))
+      job = await InterviewAPI.getScoreCalculationStatus(resumeId)
+    }
+
+    return job
   }
 
   /**
@@ -484,4 +532,5 @@ export type {
   UpdateResumeData,
   InterviewSession,
   InterviewConfig,
+  ScoreCalculationJob,
 }
\ No newline at end of file